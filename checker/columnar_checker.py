@@ -0,0 +1,284 @@
+# This file is part of FireFind Project.
+#
+# Copyright (C) 2025 Your Name
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import itertools
+from operator import attrgetter
+
+import numpy as np
+
+from checker.gc_utils import gc_paused
+from checker.rule_checker import AddressCheck, compiled_risk_rules, rule_ports, service_port
+from parser_utils.rule_model import Rule, negate_text, tokenize
+from parser_utils.symbols import SYMBOLS
+
+
+class RuleTable:
+    """
+    Columnar view of a rule list. Field values are factorized once (distinct values
+    plus an int array of positions), so per-value work runs on the distinct values
+    only. Token fields are flattened into (codes, owning rule) arrays. Other values
+    are matched as lowered text with table-local codes, keeping per-file names and
+    comments out of the process-wide SYMBOLS.
+    """
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.n = len(rules)
+        self._columns = {}
+
+    def _cached(self, key, build):
+        if key not in self._columns:
+            self._columns[key] = build()
+        return self._columns[key]
+
+    def column(self, slot):
+        return self._cached(("column", slot), lambda: list(map(attrgetter(slot), self.rules)))
+
+    def factorize(self, field, attr=False):
+        """(distinct values, inverse) of rule.get(field) or, with attr=True, getattr(rule, field)."""
+        def build():
+            if not attr and field not in Rule.__slots__:
+                return [""], np.zeros(self.n, dtype=np.int64)
+
+            slot = f"{field}_text" if not attr and field in Rule.TOKEN_FIELDS else field
+            values = self.column(slot)
+            index = {value: k for k, value in enumerate(dict.fromkeys(values))}
+            uniques = list(index)
+            inverse = np.fromiter(map(index.__getitem__, values), dtype=np.int64, count=self.n)
+
+            # Same values Rule.get() would return
+            if not attr and field in Rule.NEGATE_FIELDS:
+                uniques = [negate_text(u) for u in uniques]
+            elif not attr:
+                uniques = ["" if u is None else u for u in uniques]
+            return uniques, inverse
+        return self._cached(("values", field, attr), build)
+
+    def lowered(self, field, attr=False):
+        """(distinct str(value).lower() texts, index into them for every rule)."""
+        def build():
+            uniques, inverse = self.factorize(field, attr)
+            index = {}
+            lut = np.fromiter((index.setdefault(str(u).lower(), len(index)) for u in uniques),
+                              dtype=np.int64, count=len(uniques))
+            return list(index), lut[inverse]
+        return self._cached(("lower", field, attr), build)
+
+    def value_in(self, field, texts, attr=False):
+        """True where str(value).lower() is one of texts (lowercased config values)."""
+        lowered, inverse = self.lowered(field, attr)
+        return np.array([text in texts for text in lowered], dtype=bool)[inverse]
+
+    def blank(self, field):
+        """True where str(rule.get(field)).strip() is empty."""
+        def build():
+            uniques, inverse = self.factorize(field)
+            lut = np.array([not str(u).strip() for u in uniques], dtype=bool)
+            return lut[inverse]
+        return self._cached(("blank", field), build)
+
+    def flag(self, field):
+        """True where a negate slot is set (None/False -> False)."""
+        def build():
+            values = self.column(field)
+            return np.array(values, dtype=bool) if any(values) else np.zeros(self.n, dtype=bool)
+        return self._cached(("flag", field), build)
+
+    def tokens(self, field):
+        """(codes, owner) arrays of every token of field, in rule and token order."""
+        def build():
+            # Tokenize each distinct value once (token tuples are shared), then gather per rule
+            if field in Rule.TOKEN_FIELDS:
+                per_value, inverse = self.factorize(field, attr=True)
+            else:
+                uniques, inverse = self.factorize(field)
+                per_value = [tokenize(str(u)) for u in uniques]
+            value_codes = np.fromiter(itertools.chain.from_iterable(per_value), dtype=np.int64)
+            value_lengths = np.array([len(t) for t in per_value], dtype=np.int64)
+            value_starts = np.cumsum(value_lengths) - value_lengths
+
+            lengths = value_lengths[inverse]
+            row_starts = np.cumsum(lengths) - lengths
+            offsets = np.arange(lengths.sum()) - np.repeat(row_starts, lengths)
+            codes = value_codes[np.repeat(value_starts[inverse], lengths) + offsets]
+            return codes, np.repeat(np.arange(self.n), lengths)
+        return self._cached(("tokens", field), build)
+
+
+def isin(column, codes):
+    """column (array of symbol codes) -> True where the code is in codes."""
+    mask = np.zeros(len(SYMBOLS), dtype=bool)
+    mask[list(codes)] = True
+    return mask[column]
+
+
+def flatnonzero(mask):
+    """Indices of True entries as Python ints (cheaper to index lists with)."""
+    return np.flatnonzero(mask).tolist()
+
+
+def rules_with(owner, hits, n):
+    """Per-rule any() over token hits."""
+    out = np.zeros(n, dtype=bool)
+    out[owner[hits]] = True
+    return out
+
+
+def emit(results, check, field, rows, values):
+    """Append one finding per (row, value), shaped like rule_checker.finding()."""
+    name, severity, category = check.name, check.severity, check.category
+    for findings, value in zip(map(results.__getitem__, rows), values):
+        findings.append({"issue": name, "field": field, "value": value, "severity": severity, "category": category})
+
+
+def display_values(table, field, rows):
+    """rule.get(field) for each row index."""
+    if not rows:
+        return []
+    uniques, inverse = table.factorize(field)
+    return [uniques[k] for k in inverse[rows].tolist()]
+
+
+def evaluate_address_check(check, table, base, results):
+    scope = base & table.value_in("action", check.action_scope, attr=True)
+    for field in check.fields:
+        codes, owner = table.tokens(field)
+        matching = [c for c in np.unique(codes).tolist() if check.matches(c)]
+        has = rules_with(owner, isin(codes, matching), table.n) & scope
+        rows = flatnonzero(has)
+        emit(results, check, field, rows, display_values(table, field, rows))
+
+
+def evaluate_risk_check(check, table, base, results):
+    n = table.n
+    # ✅ Required fields check
+    if check.required_fields:
+        blanks = [(f, table.blank(f)) for f in check.required_fields]
+        missing = base & np.logical_or.reduce([b for _, b in blanks])
+        # Row order first, then required_fields order within a row
+        for i in flatnonzero(missing):
+            for f, b in blanks:
+                if b[i]:
+                    emit(results, check, f, [i], [""])
+        base = base & ~missing
+
+    # ✅ Bad names check
+    if check.bad_names:
+        bad = base & table.value_in("name", check.bad_names)
+        rows = flatnonzero(bad)
+        emit(results, check, "name", rows, display_values(table, "name", rows))
+        base = base & ~bad
+
+    # ✅ Empty values check
+    if check.empty_values:
+        field = check.empty_field
+        empty = base & table.value_in(field, check.empty_values)
+        rows = flatnonzero(empty)
+        emit(results, check, field, rows, display_values(table, field, rows))
+        base = base & ~empty
+
+    # ✅ Action scope check
+    ok = base
+    if check.action_scope:
+        ok = ok & table.value_in("action", check.action_scope, attr=True)
+
+    # Each criterion narrows ok and leaves a part that emits its matched values later
+    parts = []
+    for field, texts, codes, negate in check.match:
+        if negate:
+            ok = ok & ~table.flag(negate)
+        if field in check.TEXT_FIELDS:
+            hit = table.value_in(field, texts)
+            ok = ok & hit
+            parts.append(("value", field, table.lowered(field), hit))
+        else:
+            tokens, owner = table.tokens(field)
+            hit = isin(tokens, codes)
+            ok = ok & rules_with(owner, hit, n)
+            parts.append(("tokens", field, (tokens, owner), hit))
+
+    for field, ports, port_set, port_hits in check.match_ports:
+        if field == "service":
+            ok = ok & ~table.flag("service_negate")
+            tokens, owner = table.tokens("service")
+            matching = [c for c in np.unique(tokens).tolist() if check.service_hit(ports, port_set, port_hits, c)]
+            hit = isin(tokens, matching)
+            ok = ok & rules_with(owner, hit, n)
+            parts.append(("ports", field, (tokens, owner), hit))
+        elif field == "dst_port":
+            # One overlap test per distinct service tuple
+            ok = ok & ~table.flag("service_negate")
+            services, inverse = table.factorize("service", attr=True)
+            overlaps = [str(rule_ports(service) & port_set) for service in services]
+            hit = np.array([bool(o) for o in overlaps], dtype=bool)[inverse]
+            ok = ok & hit
+            parts.append(("value", field, (overlaps, inverse), hit))
+        else:
+            hit = table.value_in(field, ports)
+            ok = ok & hit
+            parts.append(("value", field, table.lowered(field), hit))
+
+    if not parts:
+        rows = flatnonzero(ok)
+        emit(results, check, "unspecified", rows, [""] * len(rows))
+        return
+
+    for kind, field, column, hit in parts:
+        if kind == "value":
+            # (distinct texts, index per rule)
+            texts, inverse = column
+            rows = np.flatnonzero(ok & hit)
+            codes, text = inverse[rows], texts.__getitem__
+        else:
+            tokens, owner = column
+            positions = np.flatnonzero(hit & ok[owner])
+            rows, codes = owner[positions], tokens[positions]
+            text = service_port if kind == "ports" else SYMBOLS.text
+        emit(results, check, field, rows.tolist(), map(text, codes.tolist()))
+
+
+def run_checker(rules, vendor=None):
+    """Columnar run_checker(): same {index: findings} result, each risk rule applied as one mask."""
+    rules = list(rules)
+    if dict in set(map(type, rules)):
+        rules = [Rule.from_dict(r) if isinstance(r, dict) else r for r in rules]
+    with gc_paused():
+        return check_table(RuleTable(rules), vendor)
+
+
+def check_table(table, vendor=None):
+    results = list(map(list, itertools.repeat((), table.n)))
+
+    # ✅ Skip rules that are disabled in the CSV
+    enabled = ~table.value_in("status", {"disable"}, attr=True)
+
+    vendors, vendor_of = table.factorize("vendor", attr=True)
+    for k, rule_vendor in enumerate(vendors):
+        rule_vendor = vendor if rule_vendor is None else rule_vendor
+        base = enabled & (vendor_of == k)
+        for check in compiled_risk_rules(rule_vendor):
+            if isinstance(check, AddressCheck):
+                evaluate_address_check(check, table, base, results)
+            else:
+                evaluate_risk_check(check, table, base, results)
+
+    return dict(enumerate(results, start=1))
+
+
+def iter_checker(rules, vendor=None):
+    """Drop-in for rule_checker.iter_checker(); the whole rule list is checked before yielding."""
+    yield from run_checker(rules, vendor).items()
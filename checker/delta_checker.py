@@ -0,0 +1,218 @@
+# This file is part of FireFind Project.
+#
+# Copyright (C) 2025 Your Name
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import hashlib
+import json
+import os
+from operator import attrgetter
+
+from checker import policy_analyzer, rule_checker
+from checker.gc_utils import gc_paused
+from config.config_loader import get_config
+from parser_utils import parse_cache, rule_parser
+from parser_utils.rule_model import Rule
+
+# Everything but the rule id decides a rule's findings. Token codes are left out:
+# they differ between runs, and the *_text slots hold the same content.
+FINGERPRINT_SLOTS = [slot for slot in Rule.__slots__ if slot != "id" and slot not in Rule.TOKEN_FIELDS]
+fingerprint_state = attrgetter(*FINGERPRINT_SLOTS)
+
+
+def rule_fingerprint(rule):
+    """Stable content hash of a rule (id excluded)."""
+    content = "\x1f".join(map(str, fingerprint_state(rule)))
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def finding_key(finding):
+    return finding["issue"], finding.get("field", "-"), str(finding.get("value", "-"))
+
+
+# Snapshots are plain JSON, like parse cache entries; bumped when what they hold changes
+SNAPSHOT_FORMAT = "firefind-findings"
+SNAPSHOT_VERSION = "3"
+
+
+def snapshot_path(file_path, vendor, cache_dir=parse_cache.CACHE_DIR):
+    """Findings snapshots are keyed on the parse cache key plus the whole config."""
+    config_digest = get_config().data_digest()
+    key = hashlib.sha256(
+        f"{SNAPSHOT_VERSION}:{parse_cache.cache_key(file_path, vendor)}:{config_digest}".encode("utf-8")
+    ).hexdigest()
+    return os.path.join(cache_dir, f"{key}.findings")
+
+
+def load_snapshot(path):
+    """[(rule id, fingerprint, findings), ...] of an earlier run, or None."""
+    try:
+        with open(path, "rb") as f:
+            stored = json.load(f)
+        if stored["format"] != SNAPSHOT_FORMAT or stored["version"] != SNAPSHOT_VERSION:
+            return None
+        snapshot = [(rule_id, fingerprint, findings) for rule_id, fingerprint, findings in stored["rules"]]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    os.utime(path)  # mark as recently used for LRU eviction
+    return snapshot
+
+
+def store_snapshot(path, snapshot):
+    """Store a snapshot next to the parse cache, whose size limit it counts towards."""
+    try:
+        cache_dir = os.path.dirname(path)
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"format": SNAPSHOT_FORMAT, "version": SNAPSHOT_VERSION, "rules": snapshot}, f,
+                      separators=(",", ":"))
+        os.replace(tmp_path, path)
+        parse_cache.evict(cache_dir)
+    except OSError as e:
+        print(f"⚠️ Could not write findings snapshot: {e}")
+
+
+def rule_findings(findings):
+    """Findings of a rule on its own, without the policy findings that depend on other rules."""
+    return [f for f in findings if f["issue"] not in policy_analyzer.POLICY_ISSUES]
+
+
+def check_snapshot(file_path, vendor, use_cache=True, known=None):
+    """
+    Parse and check one export, returning [(rule id, fingerprint, findings), ...].
+    Rules whose fingerprint is in known (fingerprint -> findings) are not re-checked.
+    Policy findings are recomputed over the whole export every time, in the same pass.
+    Returns (snapshot, number of rules actually checked).
+    """
+    known = known or {}
+    policy = policy_analyzer.PolicySpaces(vendor)
+    snapshot, checked = [], 0
+    for rule in policy.observe(parse_cache.iter_rules(file_path, vendor=vendor, use_cache=use_cache)):
+        fingerprint = rule_fingerprint(rule)
+        findings = known.get(fingerprint)
+        if findings is None:
+            findings = rule_checker.check_rule(rule, rule.get("vendor", vendor))
+            checked += 1
+        else:
+            findings = list(findings)
+        snapshot.append((str(rule.id), fingerprint, findings))
+    for idx, findings in policy.findings().items():
+        snapshot[idx - 1][2].extend(findings)
+    return snapshot, checked
+
+
+def previous_snapshot(file_path, vendor, use_cache=True):
+    """Findings of the previous export: from its stored snapshot, or a full run stored for next time."""
+    path = snapshot_path(file_path, vendor)
+    snapshot = load_snapshot(path) if use_cache else None
+    if snapshot is not None:
+        print(f"✅ Loaded findings for {len(snapshot)} previous rules from snapshot")
+        return snapshot
+
+    snapshot, _ = check_snapshot(file_path, vendor, use_cache)
+    if use_cache:
+        store_snapshot(path, snapshot)
+    return snapshot
+
+
+def keyed(snapshot):
+    """{(rule id, occurrence): (fingerprint, findings)}; exports can repeat an id."""
+    seen, keyed_rules = {}, {}
+    for rule_id, fingerprint, findings in snapshot:
+        occurrence = seen[rule_id] = seen.get(rule_id, -1) + 1
+        keyed_rules[(rule_id, occurrence)] = (fingerprint, findings)
+    return keyed_rules
+
+
+def compare(previous, current):
+    """
+    Classify rules and findings between two snapshots. Rules are paired in passes:
+    same id and fingerprint (unchanged), same fingerprint under another id
+    (renumbered, unchanged), then same id only (modified); the rest are added/removed.
+    Returns (rule counts, [(status, rule id, finding), ...]) with status new/resolved/persisting.
+    """
+    previous_rules = keyed(previous)
+    current_rules = keyed(current)
+    counts = {"added": 0, "modified": 0, "unchanged": 0, "removed": 0}
+    pairs = {}
+
+    # Pass 1: same id and content
+    for key, (fingerprint, _) in current_rules.items():
+        if key in previous_rules and previous_rules[key][0] == fingerprint:
+            pairs[key] = key
+    counts["unchanged"] += len(pairs)
+    matched = set(pairs.values())
+
+    # Pass 2: same content under a new id (rules renumbered after an insert/delete)
+    previous_by_fingerprint = {}
+    for key, (fingerprint, _) in previous_rules.items():
+        if key not in matched:
+            previous_by_fingerprint.setdefault(fingerprint, []).append(key)
+    for key, (fingerprint, _) in current_rules.items():
+        candidates = previous_by_fingerprint.get(fingerprint)
+        if key not in pairs and candidates:
+            pairs[key] = candidates.pop(0)
+            matched.add(pairs[key])
+            counts["unchanged"] += 1
+
+    # Pass 3: same id, different content
+    for key in current_rules:
+        if key not in pairs and key in previous_rules and key not in matched:
+            pairs[key] = key
+            matched.add(key)
+            counts["modified"] += 1
+
+    rows = []
+    for key, (fingerprint, findings) in current_rules.items():
+        rule_id = key[0]
+        old_key = pairs.get(key)
+        if old_key is None:
+            counts["added"] += 1
+            rows.extend(("new", rule_id, f) for f in findings)
+            continue
+
+        # Diffed even when the content is unchanged: policy findings depend on other rules
+        _, old_findings = previous_rules[old_key]
+        old_keys = {finding_key(f) for f in old_findings}
+        new_keys = {finding_key(f) for f in findings}
+        rows.extend(("persisting" if finding_key(f) in old_keys else "new", rule_id, f) for f in findings)
+        rows.extend(("resolved", rule_id, f) for f in old_findings if finding_key(f) not in new_keys)
+
+    for key, (_, findings) in previous_rules.items():
+        if key not in matched:
+            counts["removed"] += 1
+            rows.extend(("resolved", key[0], f) for f in findings)
+
+    return counts, rows
+
+
+def run_delta(previous_file, current_file, vendor=None, use_cache=True):
+    """
+    Check current_file against previous_file: only added or modified rules are
+    checked, findings of unchanged rules are carried forward.
+    Returns (current snapshot, rule counts, delta rows, number of rules checked).
+    """
+    vendor = vendor or rule_parser.detect_vendor(current_file)
+    with gc_paused():
+        previous = previous_snapshot(previous_file, vendor or rule_parser.detect_vendor(previous_file), use_cache)
+
+        known = {fingerprint: rule_findings(findings) for _, fingerprint, findings in previous}
+        current, checked = check_snapshot(current_file, vendor, use_cache, known)
+        if use_cache:
+            store_snapshot(snapshot_path(current_file, vendor), current)
+
+        counts, rows = compare(previous, current)
+    return current, counts, rows, checked
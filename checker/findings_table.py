@@ -0,0 +1,134 @@
+# This file is part of FireFind Project.
+#
+# Copyright (C) 2025 Your Name
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Findings of a run stored column-wise: one array entry per finding for the rule
+position and the codes of its issue, field, value, severity and category. Codes
+come from the table's own SymbolTable, so free-text finding values go away with
+the table instead of piling up in the process-wide SYMBOLS. Severity and category
+counts are kept as rules are added, so report rollups don't rescan the findings.
+"""
+
+from array import array
+
+from parser_utils.symbols import SymbolTable
+
+NO_ISSUES = "No issues found"
+
+# Finding keys stored as columns, with the value used when a finding lacks one
+COLUMNS = ("issue", "field", "value", "severity", "category")
+DEFAULTS = {"field": "-", "value": "-", "category": "-"}
+
+
+def text(value):
+    return "" if value is None else str(value)
+
+
+class FindingsTable:
+    """Checked rules in the order they were added, with their findings as parallel arrays."""
+
+    def __init__(self):
+        self.rule_ids = []
+        # Findings of rule pos are entries starts[pos]:starts[pos + 1]
+        self.starts = array("I", [0])
+        self.rules = array("I")
+        self.columns = {name: array("I") for name in COLUMNS}
+        self.symbols = SymbolTable()
+        # Upper-cased severity -> count, with one INFO per rule without findings
+        self.severity_count = {}
+        # Category -> count over findings
+        self.category_count = {}
+        # (issue, severity, category) -> count over findings
+        self.issue_count = {}
+
+    def __len__(self):
+        """Number of findings."""
+        return len(self.rules)
+
+    @property
+    def rule_count(self):
+        return len(self.rule_ids)
+
+    def add(self, rule_id, findings):
+        """Append one checked rule and its finding dicts; returns the rule's position."""
+        pos = len(self.rule_ids)
+        self.rule_ids.append(rule_id)
+        self.append_findings(pos, findings)
+        if not findings:
+            self.severity_count["INFO"] = self.severity_count.get("INFO", 0) + 1
+        self.starts.append(len(self.rules))
+        return pos
+
+    def merge(self, extra):
+        """
+        Append findings to rules already in the table, {position: [finding dicts]},
+        e.g. policy findings known once every rule is checked. The columns are
+        rebuilt in one pass, copying the runs between merged rules in bulk.
+        """
+        if not extra:
+            return
+        starts, rules, columns = self.starts, self.rules, self.columns
+        self.starts, self.rules = array("I", [0]), array("I")
+        self.columns = {name: array("I") for name in COLUMNS}
+
+        copied = 0  # rules before this position are in the new columns
+        for pos in sorted(extra) + [self.rule_count]:
+            end = min(pos + 1, self.rule_count)
+            lo, hi = starts[copied], starts[end]
+            shift = len(self.rules) - lo
+            self.rules.extend(rules[lo:hi])
+            for name, column in self.columns.items():
+                column.extend(columns[name][lo:hi])
+            self.starts.extend(start + shift for start in starts[copied + 1:end + 1])
+            copied = end
+            if pos < self.rule_count and extra[pos]:
+                if starts[pos] == starts[pos + 1]:
+                    self.severity_count["INFO"] -= 1
+                self.append_findings(pos, extra[pos])
+                self.starts[-1] = len(self.rules)
+
+    def append_findings(self, pos, findings):
+        for finding in findings:
+            self.rules.append(pos)
+            for name, column in self.columns.items():
+                column.append(self.symbols.code(text(finding.get(name, DEFAULTS.get(name)))))
+            severity = text(finding.get("severity")).upper()
+            self.severity_count[severity] = self.severity_count.get(severity, 0) + 1
+            category = text(finding.get("category", "-"))
+            self.category_count[category] = self.category_count.get(category, 0) + 1
+            issue = (text(finding.get("issue")), text(finding.get("severity")), category)
+            self.issue_count[issue] = self.issue_count.get(issue, 0) + 1
+
+    def findings(self, pos):
+        """(issue, field, value, severity, category) texts of one rule's findings."""
+        columns = [self.columns[name][self.starts[pos]:self.starts[pos + 1]] for name in COLUMNS]
+        return [tuple(map(self.symbols.text, codes)) for codes in zip(*columns)]
+
+    def rows(self, positions=None):
+        """
+        (rule_id, issue, field, value, severity, category) rows of the rules at
+        positions (all by default); a rule without findings gets one NO_ISSUES row.
+        """
+        if positions is None:
+            positions = range(self.rule_count)
+        for pos in positions:
+            rule_id = self.rule_ids[pos]
+            found = self.findings(pos)
+            if not found:
+                yield rule_id, NO_ISSUES, "-", "-", "", "-"
+            for row in found:
+                yield (rule_id,) + row
@@ -0,0 +1,114 @@
+# This file is part of FireFind Project.
+#
+# Copyright (C) 2025 Your Name
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import itertools
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from checker import rule_checker
+from parser_utils import rule_columns
+from parser_utils.rule_model import Rule
+from parser_utils.symbols import SYMBOLS
+
+# Below this many rules the pool startup costs more than it saves
+PARALLEL_MIN_RULES = 20000
+
+# Rules per chunk handed to a worker
+CHUNK_RULES = 5000
+
+# Chunks packed ahead per worker; later chunks are packed as results come back
+CHUNKS_PER_WORKER = 2
+
+
+def pack_chunk(rules):
+    """
+    One shared memory block holding a chunk of rules as rule_columns buffers
+    (token codes as-is: workers share our symbol codes). Returns (block, layout).
+    """
+    layout, parts = rule_columns.pack_rules(rules)
+    block = shared_memory.SharedMemory(create=True, size=max(layout["size"], 1))
+    offset = 0
+    for part in parts:
+        block.buf[offset:offset + len(part)] = part
+        offset += len(part)
+    return block, layout
+
+
+def release(block):
+    block.close()
+    block.unlink()
+
+
+def init_worker(symbols):
+    """Pool initializer: adopt the parent's symbol codes so packed token codes decode the same."""
+    SYMBOLS.load(symbols)
+
+
+def check_chunk(block_name, layout, vendor=None):
+    """Pool worker: rebuild one chunk of rules straight out of shared memory and check it."""
+    block = shared_memory.SharedMemory(name=block_name)
+    try:
+        rules = rule_columns.unpack_rules(block.buf, layout)
+    finally:
+        block.close()
+    return [rule_checker.check_rule(rule, rule.get("vendor", vendor)) for rule in rules]
+
+
+def iter_checker(rules, vendor=None, workers=None, min_rules=PARALLEL_MIN_RULES):
+    """
+    run_checker() across a process pool: yields (index, findings) in rule order with
+    the same 1-based indexes. Small inputs and workers=1 use the serial checker.
+    Rules are read, packed and submitted a chunk at a time, so only a few chunks
+    are held in shared memory at once.
+    """
+    rules = (Rule.from_dict(r) if isinstance(r, dict) else r for r in rules)
+    workers = workers or os.cpu_count() or 1
+    head = list(itertools.islice(rules, min_rules))
+
+    if workers <= 1 or len(head) < min_rules:
+        yield from rule_checker.iter_checker(itertools.chain(head, rules), vendor)
+        return
+
+    rules = itertools.chain(head, rules)
+    chunks = iter(lambda: list(itertools.islice(rules, CHUNK_RULES)), [])
+    pending, start = deque(), 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                 initargs=(SYMBOLS.snapshot(),)) as pool:
+            for chunk in itertools.chain(chunks, [None]):
+                if chunk is not None:
+                    block, layout = pack_chunk(chunk)
+                    pending.append((start, block, pool.submit(check_chunk, block.name, layout, vendor)))
+                    start += len(chunk)
+                # Drain down to the read-ahead window (everything once the rules run out)
+                while pending and (chunk is None or len(pending) >= workers * CHUNKS_PER_WORKER):
+                    first, block, future = pending[0]
+                    findings = future.result()
+                    pending.popleft()
+                    release(block)
+                    yield from enumerate(findings, start=first + 1)
+    finally:
+        for _, block, future in pending:
+            future.cancel()
+            release(block)
+
+
+def run_checker(rules, vendor=None, workers=None, min_rules=PARALLEL_MIN_RULES):
+    """Parallel run_checker(): {1-based index: findings}."""
+    return dict(iter_checker(rules, vendor, workers, min_rules))
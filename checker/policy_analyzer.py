@@ -0,0 +1,350 @@
+# This file is part of FireFind Project.
+#
+# Copyright (C) 2025 Your Name
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Rule-against-rule analysis: shadowed, redundant and conflicting rules.
+
+Each enabled, non-negated rule matches a box of source address x destination
+address x service. Addresses and ports are integer ranges (parser_utils.addresses,
+parser_utils.ports); object names that don't resolve are compared by name.
+"""
+
+import heapq
+from operator import itemgetter
+
+from checker import rule_checker
+from checker.gc_utils import gc_paused
+from checker.rule_checker import evaluate_category, evaluate_severity, finding
+from parser_utils.addresses import FULL_RANGE, IntervalIndex, code_intervals
+from parser_utils.ports import ANY_SERVICES
+from parser_utils.ranges import RangeSet
+from parser_utils.symbols import SYMBOLS
+
+# Issue -> finding field; the finding value is the index of the other rule
+POLICY_ISSUES = {
+    "shadowed_rule": "shadowed_by",
+    "redundant_rule": "redundant_to",
+    "conflicting_rule": "conflicts_with",
+}
+
+ALLOW_ACTIONS = frozenset(["accept", "allow"])
+DENY_ACTIONS = frozenset(["deny", "drop", "reject"])
+
+ADDRESS_LINE = RangeSet([FULL_RANGE])
+
+
+class Space:
+    """
+    One dimension of a rule's match box: its token codes plus the merged ranges of
+    the tokens that resolve. complete means every token resolved, so the ranges are
+    the whole space; otherwise they're a known part of it.
+    """
+
+    __slots__ = ("codes", "ranges", "complete", "full")
+
+    def __init__(self, codes, ranges, complete, full):
+        self.codes = codes
+        self.ranges = ranges
+        self.complete = complete
+        self.full = full
+
+    def covers(self, other):
+        if self.full or other.codes <= self.codes:
+            return True
+        return other.complete and self.ranges.covers(other.ranges)
+
+    def overlaps(self, other):
+        if self.full or other.full or not self.codes.isdisjoint(other.codes):
+            return True
+        return self.ranges.overlaps(other.ranges)
+
+
+def address_space(codes):
+    intervals = [code_intervals(code) for code in codes]
+    ranges = RangeSet(interval for found in intervals for interval in found)
+    return Space(frozenset(codes), ranges, all(intervals), ranges.covers(ADDRESS_LINE))
+
+
+def service_space(codes):
+    port_sets = [rule_checker.service_ports(code) for code in codes]
+    ranges = RangeSet(r for ports in port_sets for r in ports.ranges())
+    full = any(SYMBOLS.text(code) in ANY_SERVICES for code in codes)
+    return Space(frozenset(codes), ranges, all(port_sets), full)
+
+
+class SpaceIndex:
+    """
+    The distinct values of one dimension, indexed to answer "which values cover
+    (or overlap) this one": any/all values, values sharing the query's tokens, and
+    values with a range reaching the query's (IntervalIndex over every value's
+    ranges). Answers are cached per value.
+    """
+
+    def __init__(self, spaces):
+        self.full = [space for space in spaces if space.full]
+        self.by_code = {}
+        for space in spaces:
+            for code in space.codes:
+                self.by_code.setdefault(code, []).append(space)
+        self.ranges = IntervalIndex((r, space) for space in spaces for r in space.ranges.ranges())
+        self.cache = {}
+        self.overlap_cache = {}
+
+    def covering(self, space):
+        found = self.cache.get(space)
+        if found is None:
+            candidates = set(self.full)
+            candidates.update(self.by_code[min(space.codes, key=lambda code: len(self.by_code[code]))])
+            if space.complete:
+                # A cover by ranges has one range holding the query's first range
+                candidates.update(self.ranges.containing(next(space.ranges.ranges())))
+            found = self.cache[space] = frozenset(c for c in candidates if c.covers(space))
+        return found
+
+    def overlapping(self, space):
+        """Values overlapping space, or None for "all of them" (an any/all query)."""
+        if space.full:
+            return None
+        found = self.overlap_cache.get(space)
+        if found is None:
+            found = set(self.full)
+            for code in space.codes:
+                found.update(self.by_code[code])
+            for r in space.ranges.ranges():
+                found.update(self.ranges.overlapping(r))
+            found = self.overlap_cache[space] = found
+        return found
+
+
+def rule_spaces(rule, spaces):
+    """(src, dst, service) Spaces of a rule, or None when it can't be reasoned about."""
+    if str(rule.status).lower() == "disable":
+        return None
+    if rule.srcaddr_negate or rule.dstaddr_negate or rule.service_negate:
+        return None
+    if not (rule.srcaddr and rule.dstaddr and rule.service):
+        return None
+
+    box = []
+    for field, build in (("srcaddr", address_space), ("dstaddr", address_space), ("service", service_space)):
+        codes = getattr(rule, field)
+        key = (build, codes)
+        if key not in spaces:
+            spaces[key] = build(codes)
+        box.append(spaces[key])
+    return tuple(box)
+
+
+def evaluation_order(ids):
+    """Rule positions in evaluation order: by numeric id when every id is numeric, else as listed."""
+    if all(rule_id.isdigit() for rule_id in ids):
+        return sorted(range(len(ids)), key=lambda pos: int(ids[pos]))
+    return list(range(len(ids)))
+
+
+# ---------------- Tries of earlier rules ----------------
+# src Space -> [first rank, dst Space -> [first rank, service Space -> first rank]]
+# Rules are inserted in evaluation order, so each node's first rank is the smallest
+# below it and sibling dicts iterate in ascending first rank.
+
+def insert(trie, box, rank):
+    src, dst, svc = box
+    dst_level = trie.setdefault(src, [rank, {}])[1]
+    svc_level = dst_level.setdefault(dst, [rank, {}])[1]
+    svc_level.setdefault(svc, rank)
+
+
+def present(level, values):
+    """Nodes of a trie level for the given values, by ascending first rank."""
+    if len(values) <= len(level):
+        nodes = [level[value] for value in values if value in level]
+    else:
+        nodes = [node for value, node in level.items() if value in values]
+    return sorted(nodes, key=itemgetter(0))
+
+
+def first_covering(trie, box, indexes):
+    """Rank of the earliest rule in trie whose box covers box, or None."""
+    best = None
+    for node in present(trie, indexes[0].covering(box[0])):
+        if best is not None and node[0] >= best:
+            break
+        for leaf in present(node[1], indexes[1].covering(box[1])):
+            if best is not None and leaf[0] >= best:
+                break
+            for rank in map(leaf[1].get, indexes[2].covering(box[2])):
+                if rank is not None and (best is None or rank < best):
+                    best = rank
+    return best
+
+
+class Postings:
+    """
+    Ranks of the earlier rules of one action in ascending order, grouped by which
+    dimensions are any/all and then listed per value of the other dimensions.
+    Any/all rules overlap every query in that dimension, so keeping them apart
+    lets each group be searched through its own most selective dimension.
+    """
+
+    def __init__(self):
+        self.groups = {}  # (full per dimension) -> (ranks, per-dimension {value: ranks})
+
+    def add(self, box, rank):
+        ranks, by_value = self.groups.setdefault(tuple(space.full for space in box), ([], ({}, {}, {})))
+        ranks.append(rank)
+        for dim, space in enumerate(box):
+            if not space.full:
+                by_value[dim].setdefault(space, []).append(rank)
+
+    def candidates(self, overlapping):
+        """
+        Ascending ranks that may overlap a box whose overlapping values per dimension
+        are given (None: every value). Per group, only the rules matching in the
+        dimension with the fewest of them are produced. Dimensions are sized in order
+        of their value count, stopping once sizing one costs more than the best scan.
+        """
+        dims = sorted((len(found), dim) for dim, found in enumerate(overlapping) if found is not None)
+        streams = []
+        for full, (ranks, by_value) in self.groups.items():
+            best_lists, best_size = None, len(ranks)
+            for count, dim in dims:
+                if count >= best_size:
+                    break
+                if full[dim]:
+                    continue
+                found, table = overlapping[dim], by_value[dim]
+                lists = [table[value] for value in found if value in table]
+                size = sum(map(len, lists))
+                if size < best_size:
+                    best_lists, best_size = lists, size
+            streams.append(ranks if best_lists is None else heapq.merge(*best_lists))
+        return heapq.merge(*streams)
+
+
+def first_conflict(postings, box, indexes, entries):
+    """
+    Rank of the earliest rule in postings that overlaps box without being covered by
+    it (a broader later rule, like a closing deny-all, is deliberate and not reported).
+    """
+    overlapping = [index.overlapping(space) for index, space in zip(indexes, box)]
+    for rank in postings.candidates(overlapping):
+        other = entries[rank][2]
+        if not all(found is None or value in found for found, value in zip(overlapping, other)):
+            continue
+        if not all(mine.covers(theirs) for mine, theirs in zip(box, other)):
+            return rank
+    return None
+
+
+def policy_issues(vendor=None):
+    """Names of the vendor's enabled policy-scope risk rules."""
+    return {
+        name for name, details in rule_checker.vendor_risk_rules(vendor).items()
+        if details.get("scope") == "policy" and details.get("enabled", False)
+    }
+
+
+class PolicySpaces:
+    """
+    Ids, actions and spaces of a policy's rules, gathered as the rules stream past
+    (see observe()) so the policy is compared once it is complete, without a second
+    parse. With sheet set, the other rule's id in findings is tagged with the
+    worksheet name, like the rule ids of workbook runs.
+    """
+
+    def __init__(self, vendor=None, sheet=None):
+        self.vendor = vendor
+        self.sheet = sheet
+        self.enabled = None
+        self.spaces = {}
+        self.ids = []
+        self.boxes = []
+
+    def add(self, rule):
+        if self.enabled is None:
+            if self.vendor is None:
+                self.vendor = rule.get("vendor", None)
+            self.enabled = policy_issues(self.vendor)
+        self.ids.append(str(rule.id).strip())
+        if not self.enabled:
+            return
+        action = str(rule.action).lower()
+        box = None
+        if action in ALLOW_ACTIONS or action in DENY_ACTIONS:
+            box = rule_spaces(rule, self.spaces)
+        self.boxes.append(None if box is None else (action in ALLOW_ACTIONS, box))
+
+    def observe(self, rules):
+        """Yield rules unchanged, adding each one on the way."""
+        for rule in rules:
+            self.add(rule)
+            yield rule
+
+    def rule_label(self, pos):
+        rule_id = self.ids[pos]
+        return f"{self.sheet}:{rule_id}" if self.sheet else rule_id
+
+    def findings(self):
+        """
+        Compares the rules with each other in evaluation order. Returns {1-based
+        index: [finding dicts]} like run_checker(), the value being the other rule's id:
+          shadowed_rule    an earlier rule with the opposite action covers this one
+          redundant_rule   an earlier rule with the same action covers this one
+          conflicting_rule an earlier rule with the opposite action partly overlaps it
+        Issues are switched on by risk_rules entries with "scope": "policy".
+        """
+        if not self.enabled:
+            return {}
+        vendor, enabled = self.vendor, self.enabled
+
+        # Tries and postings hold no cycles; skip the collector while they grow
+        with gc_paused():
+            entries = [(pos,) + self.boxes[pos] for pos in evaluation_order(self.ids)
+                       if self.boxes[pos] is not None]
+            indexes = [SpaceIndex({box[dim] for _, _, box in entries}) for dim in range(3)]
+            tries = {True: {}, False: {}}
+            postings = {True: Postings(), False: Postings()}
+            results = {}
+            for rank, (pos, allows, box) in enumerate(entries):
+                same = first_covering(tries[allows], box, indexes)
+                opposite = first_covering(tries[not allows], box, indexes)
+
+                issue, other = None, None
+                if opposite is not None and (same is None or opposite < same):
+                    issue, other = "shadowed_rule", opposite
+                elif same is not None:
+                    issue, other = "redundant_rule", same
+                else:
+                    other = first_conflict(postings[not allows], box, indexes, entries)
+                    if other is not None:
+                        issue = "conflicting_rule"
+
+                if issue in enabled:
+                    results[pos + 1] = [finding(issue, POLICY_ISSUES[issue], self.rule_label(entries[other][0]),
+                                                evaluate_severity(issue, vendor),
+                                                evaluate_category(issue, vendor))]
+                insert(tries[allows], box, rank)
+                postings[allows].add(box, rank)
+        return results
+
+
+def analyze_policy(rules, vendor=None, sheet=None):
+    """PolicySpaces.findings() of an iterable of rules."""
+    policy = PolicySpaces(vendor, sheet)
+    for rule in rules:
+        policy.add(rule)
+    return policy.findings()
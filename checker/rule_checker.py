@@ -16,220 +16,408 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 
+from functools import lru_cache
 
-import re
-from config.config_loader import load_config
-
-# Load JSON config
-config = load_config()
-
-# ✅ Load service port map from JSON instead of hardcoding
-SERVICE_PORT_MAP = config.data.get("service_port_map", {})
+from config.config_loader import get_config, on_change
+from parser_utils.addresses import ANY_TOKENS, IntervalIndex, code_intervals, contains, is_ipv4, parse_address, prefix_length
+from parser_utils.ports import ANY_SERVICES, EMPTY, parse_service
+from parser_utils.rule_model import Rule
+from parser_utils.symbols import SYMBOLS
 
 def evaluate_severity(issue_type, vendor=None):
     """Gets severity from JSON config based on vendor or global risk_rules."""
-    if vendor and "vendor_mappings" in config.data:
-        vendor_rules = config.data["vendor_mappings"].get(vendor, {}).get("risk_rules", {})
-        if issue_type in vendor_rules:
-            return vendor_rules[issue_type].get("severity", "UNKNOWN")
-    return config.data.get("risk_rules", {}).get(issue_type, {}).get("severity", "UNKNOWN")
+    return get_config().severity(issue_type, vendor)
 
 def evaluate_category(issue_type, vendor=None):
     """Gets category from JSON config based on vendor or global risk_rules."""
-    if vendor and "vendor_mappings" in config.data:
-        vendor_rules = config.data["vendor_mappings"].get(vendor, {}).get("risk_rules", {})
-        if issue_type in vendor_rules:
-            return vendor_rules[issue_type].get("category", "Uncategorized")
-    return config.data.get("risk_rules", {}).get(issue_type, {}).get("category", "Uncategorized")
+    return get_config().category(issue_type, vendor)
 
 def normalize_service(service_value):
-    """Convert service names into port numbers when possible."""
+    """Convert service names into port numbers when possible (service_port_map)."""
     service_value = str(service_value).lower()
-    return SERVICE_PORT_MAP.get(service_value, service_value)
-
-def check_rule(rule, vendor=None):
-    """Runs all risk checks dynamically from JSON config."""
-    findings = []
-
-    # ✅ Skip rules that are disabled in the CSV
-    if rule.get("status", "").lower() == "disable":
-        return findings
-
-    # ✅ Choose vendor-specific rules if available
-    risk_rules = {}
-    if vendor and "vendor_mappings" in config.data:
-        risk_rules = config.data["vendor_mappings"].get(vendor, {}).get("risk_rules", {})
-
-    # Fallback to global rules if vendor-specific not found
-    if not risk_rules:
-        risk_rules = config.data.get("risk_rules", {})
-
-    for rule_name, rule_details in risk_rules.items():
-        if not rule_details.get("enabled", False):
-            continue
-
-        # ✅ Special case: broad_ip_range → use OR logic and values from JSON
-        if rule_name.lower() == "broad_ip_range":
-            action_value = str(rule.get("action", "")).lower()
-            allowed_actions = [a.lower() for a in rule_details.get("action_scope", [])]
-            risky_values = [v.lower() for v in rule_details.get("values", [])]
-
-            if action_value in allowed_actions:
-                for field in ["srcaddr", "dstaddr", "src_address", "dst_address"]:
-                    val = str(rule.get(field, "")).strip().lower()
-                    if not val:
-                        continue
-
-                    tokens = re.split(r"[\s,;]+", val)
-                    tokens = [t.strip() for t in tokens if t.strip()]
-
-                    if any(t in risky_values for t in tokens):
-                        findings.append({
-                            "issue": rule_name,
-                            "field": field,
-                            "value": rule.get(field, ""),
-                            "severity": evaluate_severity(rule_name, vendor),
-                            "category": evaluate_category(rule_name, vendor)
-                        })
-            continue  # skip default logic for this rule
-
-        # -----------------------------
-        # Normal rules (AND logic)
-        # -----------------------------
-        match_criteria = rule_details.get("match", {})
-        match_ports = rule_details.get("match_ports", {})
-        required_fields = rule_details.get("required_fields", [])
-        bad_names = rule_details.get("bad_names", [])
-        empty_values = rule_details.get("empty_values", [])
-        action_scope = rule_details.get("action_scope", [])
-
-        match_ok = True
-        matched_fields = []
-
-        # ✅ Match field values
-        for field, values in match_criteria.items():
-            rule_value = str(rule.get(field, "")).lower()
-            values_normalized = [v.lower() for v in values]
-
-            # Negate logic
-            if field == "srcaddr" and rule.get("srcaddr_negate", "").lower() == "enable":
-                match_ok = False
-                break
-            if field == "dstaddr" and rule.get("dstaddr_negate", "").lower() == "enable":
-                match_ok = False
-                break
-            if field == "service" and rule.get("service_negate", "").lower() == "enable":
-                match_ok = False
-                break
-
-            if field == "service":
-                tokens = re.split(r"[\s,;]+", rule_value)
-                tokens = [t.strip() for t in tokens if t.strip()]
-                matched = [t for t in tokens if t in values_normalized]
-            elif field == "log":
-                matched = [rule_value] if rule_value in values_normalized else []
-            elif field in ["src_address", "dst_address"]:
-                matched = [rule_value] if rule_value in values_normalized else []
+    return get_config().service_port_map().get(service_value, service_value)
+
+@lru_cache(maxsize=4096)
+def service_port(code):
+    """normalize_service() of a service token code."""
+    return normalize_service(SYMBOLS.text(code))
+
+def text_ports(text):
+    """PortSet of a service token or match_ports value, looked up through service_port_map first."""
+    text = str(text).lower()
+    return parse_service(normalize_service(text)) or parse_service(text)
+
+@lru_cache(maxsize=4096)
+def service_ports(code):
+    """text_ports() of a service token code."""
+    return text_ports(SYMBOLS.text(code))
+
+@lru_cache(maxsize=4096)
+def rule_ports(service):
+    """Destination ports of a rule's service token codes; any/all only count when listed literally."""
+    ports = EMPTY
+    for code in service:
+        if SYMBOLS.text(code) not in ANY_SERVICES:
+            ports = ports | service_ports(code)
+    return ports
+
+def finding(issue, field, value, severity, category):
+    return {
+        "issue": issue,
+        "field": field,
+        "value": value,
+        "severity": severity,
+        "category": category
+    }
+
+def port_union(values):
+    """One PortSet covering every match_ports value ('445', '1024-65535', 'rdp', ...)."""
+    ports = EMPTY
+    for value in values:
+        ports = ports | text_ports(value)
+    return ports
+
+# -----------------------------
+# Compiled risk rules
+# -----------------------------
+class AddressCheck:
+    """
+    OR logic over address fields: a field matches when any of its tokens does.
+    Subclasses decide per token code in match_code(); answers are kept per check.
+    """
+
+    FIELDS = ("srcaddr", "dstaddr", "src_address", "dst_address")
+
+    def __init__(self, name, details, severity, category):
+        self.name = name
+        self.severity = severity
+        self.category = category
+        self.action_scope = frozenset(a.lower() for a in details.get("action_scope", []))
+        self.fields = tuple(details.get("fields", self.FIELDS))
+        self._matches = {}
+
+    def match_code(self, code):
+        raise NotImplementedError
+
+    def matches(self, code):
+        hit = self._matches.get(code)
+        if hit is None:
+            hit = self._matches[code] = self.match_code(code)
+        return hit
+
+    def anchors(self):
+        """Any token may match, so every rule is a candidate."""
+        return None
+
+    def evaluate(self, rule):
+        if str(rule.action).lower() not in self.action_scope:
+            return []
+        return [finding(self.name, field, rule.get(field, ""), self.severity, self.category)
+                for field in self.fields
+                if any(self.matches(t) for t in rule.tokens(field))]
+
+
+class BroadRangeCheck(AddressCheck):
+    """
+    broad_ip_range: literal values from JSON, plus any network wider than the
+    optional broader_than prefix lengths ({"ipv4": 16, "ipv6": 48}).
+    """
+
+    def __init__(self, name, details, severity, category):
+        super().__init__(name, details, severity, category)
+        self.codes = SYMBOLS.codes(details.get("values", []))
+        self.broader_than = details.get("broader_than", {})
+
+    def match_code(self, code):
+        if code in self.codes:
+            return True
+        # any/all are only broad when listed in values
+        if SYMBOLS.text(code) in ANY_TOKENS:
+            return False
+        for interval in code_intervals(code):
+            family = "ipv4" if is_ipv4(interval) else "ipv6"
+            if family in self.broader_than and prefix_length(interval) < self.broader_than[family]:
+                return True
+        return False
+
+    def anchors(self):
+        """Index keys: without prefix thresholds a rule can only match on a listed value."""
+        if self.broader_than:
+            return None
+        return [("tokens", field, self.codes) for field in self.fields]
+
+
+class ProtectedNetworkCheck(AddressCheck):
+    """
+    Rules reaching a protected network: any token overlapping one of the
+    protected_networks, or with "mode": "contains", covering a whole one.
+    """
+
+    FIELDS = ("dstaddr", "dst_address")
+
+    def __init__(self, name, details, severity, category):
+        super().__init__(name, details, severity, category)
+        self.covering = details.get("mode", "overlaps") == "contains"
+        self.networks = IntervalIndex(
+            (interval, interval)
+            for network in details.get("protected_networks", [])
+            for interval in parse_address(network)
+        )
+
+    def match_code(self, code):
+        for interval in code_intervals(code):
+            for network in self.networks.overlapping(interval):
+                if not self.covering or contains(interval, network):
+                    return True
+        return False
+
+
+class RiskCheck:
+    """A normal risk rule (AND logic) with its value sets resolved once."""
+
+    # Fields compared as one whole lowercased value instead of per token
+    TEXT_FIELDS = ("log", "src_address", "dst_address")
+    # match_ports fields resolved to port sets rather than compared as text
+    PORT_FIELDS = ("service", "dst_port")
+    NEGATE = {"srcaddr": "srcaddr_negate", "dstaddr": "dstaddr_negate", "service": "service_negate"}
+
+    def __init__(self, name, details, severity, category):
+        self.name = name
+        self.severity = severity
+        self.category = category
+        self.match = tuple(
+            (field, frozenset(v.lower() for v in values), SYMBOLS.codes(values), self.NEGATE.get(field))
+            for field, values in details.get("match", {}).items()
+        )
+        # (field, lowercased names, PortSet of the names, {token code: hit})
+        self.match_ports = tuple(
+            (field, frozenset(p.lower() for p in ports), port_union(ports), {})
+            for field, ports in details.get("match_ports", {}).items()
+        )
+        self.required_fields = tuple(details.get("required_fields", []))
+        self.bad_names = frozenset(b.lower() for b in details.get("bad_names", []))
+        self.empty_values = frozenset(v.lower() for v in details.get("empty_values", []))
+        self.empty_field = details.get("field", "")
+        self.action_scope = frozenset(a.lower() for a in details.get("action_scope", []))
+
+    def finding(self, field, value):
+        return finding(self.name, field, value, self.severity, self.category)
+
+    def service_hit(self, names, port_set, hits, code):
+        """A service token matches by its normalized name or, unless it is any/all, by port overlap."""
+        hit = hits.get(code)
+        if hit is None:
+            hit = hits[code] = service_port(code) in names or (
+                SYMBOLS.text(code) not in ANY_SERVICES and service_ports(code).overlaps(port_set))
+        return hit
+
+    def anchors(self):
+        """
+        Index keys for one criterion every matching rule must meet, or None when the
+        check can fire on any rule (required_fields/bad_names/empty_values, or no criteria).
+        """
+        if self.required_fields or self.bad_names or self.empty_values:
+            return None
+
+        candidates = []
+        for field, texts, codes, _ in self.match:
+            if field in self.TEXT_FIELDS:
+                candidates.append(("value", field, texts))
             else:
-                tokens = re.split(r"[\s,;]+", rule_value)
-                tokens = [t.strip() for t in tokens if t.strip()]
-                matched = [t for t in tokens if t in values_normalized]
-
-            if matched:
-                for m in matched:
-                    matched_fields.append((field, m))
+                candidates.append(("tokens", field, codes))
+        for field, ports, _, _ in self.match_ports:
+            # service/dst_port can match on any token whose ports overlap, so they can't be keyed
+            if field not in self.PORT_FIELDS:
+                candidates.append(("value", field, ports))
+        if not candidates:
+            return None
+
+        # "action" is shared by most checks, so prefer any other field
+        candidates.sort(key=lambda anchor: anchor[1] == "action")
+        return candidates[:1]
+
+    def matched_fields(self, rule):
+        """[(field, value), ...] for a full match, or None when any criterion fails."""
+        matched = []
+
+        for field, texts, codes, negate in self.match:
+            if negate and getattr(rule, negate):
+                return None
+            if field in self.TEXT_FIELDS:
+                value = str(rule.get(field, "")).lower()
+                hits = [value] if value in texts else []
             else:
-                match_ok = False
-                break
-
-        # ✅ Match port values
-        for field, ports in match_ports.items():
-            values = []
+                hits = [SYMBOLS.text(t) for t in rule.tokens(field) if t in codes]
+            if not hits:
+                return None
+            matched.extend((field, v) for v in hits)
+
+        for field, ports, port_set, port_hits in self.match_ports:
+            if field in self.PORT_FIELDS and rule.service_negate:
+                return None
             if field == "service":
-                service_field = str(rule.get("service", ""))
-                service_parts = re.split(r"[\s,;]+", service_field)
-                values = [normalize_service(s.strip()) for s in service_parts if s.strip()]
-                if rule.get("service_negate", "").lower() == "enable":
-                    match_ok = False
-                    break
+                hits = [service_port(t) for t in rule.service if self.service_hit(ports, port_set, port_hits, t)]
             elif field == "dst_port":
-                values = [str(rule.get("dst_port", "")).lower()]
+                # The rule's destination ports as a whole, reported as the overlapping ranges
+                overlap = rule_ports(rule.service) & port_set
+                hits = [str(overlap)] if overlap else []
             else:
-                values = [str(rule.get(field, "")).lower()]
+                value = str(rule.get(field, "")).lower()
+                hits = [value] if value in ports else []
+            if not hits:
+                return None
+            matched.extend((field, v) for v in hits)
 
-            if any(v in [p.lower() for p in ports] for v in values):
-                for v in values:
-                    if v in [p.lower() for p in ports]:
-                        matched_fields.append((field, v))
-            else:
-                match_ok = False
-                break
+        return matched
 
+    def evaluate(self, rule):
         # ✅ Required fields check
-        if required_fields and any(not str(rule.get(field, "")).strip() for field in required_fields):
-            for f in required_fields:
-                if not str(rule.get(f, "")).strip():
-                    findings.append({
-                        "issue": rule_name,
-                        "field": f,
-                        "value": "",
-                        "severity": evaluate_severity(rule_name, vendor),
-                        "category": evaluate_category(rule_name, vendor)
-                    })
-            continue
+        missing = [f for f in self.required_fields if not str(rule.get(f, "")).strip()]
+        if missing:
+            return [self.finding(f, "") for f in missing]
 
         # ✅ Bad names check
-        if bad_names and str(rule.get("name", "")).lower() in [b.lower() for b in bad_names]:
-            findings.append({
-                "issue": rule_name,
-                "field": "name",
-                "value": rule.get("name", ""),
-                "severity": evaluate_severity(rule_name, vendor),
-                "category": evaluate_category(rule_name, vendor)
-            })
-            continue
+        if self.bad_names and str(rule.get("name", "")).lower() in self.bad_names:
+            return [self.finding("name", rule.get("name", ""))]
 
         # ✅ Empty values check
-        if empty_values and str(rule.get(rule_details.get("field", ""), "")).lower() in [v.lower() for v in empty_values]:
-            target_field = rule_details.get("field", "")
-            findings.append({
-                "issue": rule_name,
-                "field": target_field,
-                "value": rule.get(target_field, ""),
-                "severity": evaluate_severity(rule_name, vendor),
-                "category": evaluate_category(rule_name, vendor)
-            })
-            continue
+        if self.empty_values and str(rule.get(self.empty_field, "")).lower() in self.empty_values:
+            return [self.finding(self.empty_field, rule.get(self.empty_field, ""))]
 
         # ✅ Action scope check
-        if action_scope and str(rule.get("action", "").lower()) not in [a.lower() for a in action_scope]:
-            match_ok = False
-
-        if match_ok:
-            if matched_fields:
-                for f, v in matched_fields:
-                    findings.append({
-                        "issue": rule_name,
-                        "field": f,
-                        "value": v,
-                        "severity": evaluate_severity(rule_name, vendor),
-                        "category": evaluate_category(rule_name, vendor)
-                    })
-            else:
-                findings.append({
-                    "issue": rule_name,
-                    "field": "unspecified",
-                    "value": "",
-                    "severity": evaluate_severity(rule_name, vendor),
-                    "category": evaluate_category(rule_name, vendor)
-                })
+        if self.action_scope and str(rule.action).lower() not in self.action_scope:
+            return []
+
+        matched = self.matched_fields(rule)
+        if matched is None:
+            return []
+        if not matched:
+            return [self.finding("unspecified", "")]
+        return [self.finding(f, v) for f, v in matched]
+
+
+def vendor_risk_rules(vendor=None):
+    """A vendor's risk_rules, or the global ones when the vendor has none."""
+    return get_config().vendor_risk_rules(vendor)
+
+# Compiled checks and their RiskIndex per vendor; config_changed() drops stale ones
+COMPILED_CHECKS = {}
+RISK_INDEXES = {}
+
+def compiled_risk_rules(vendor=None):
+    """A vendor's compiled checks, built on first use and kept until its config changes."""
+    checks = COMPILED_CHECKS.get(vendor)
+    if checks is None:
+        checks = COMPILED_CHECKS[vendor] = compile_risk_rules(vendor)
+    return checks
+
+def compile_risk_rules(vendor=None):
+    """Compile a vendor's enabled per-rule risk rules (or the global ones) into checks."""
+    checks = []
+    for rule_name, rule_details in vendor_risk_rules(vendor).items():
+        if not rule_details.get("enabled", False):
+            continue
+        # Policy-scope rules compare rules with each other (checker.policy_analyzer)
+        if rule_details.get("scope") == "policy":
+            continue
+        if rule_name.lower() == "broad_ip_range":
+            check_cls = BroadRangeCheck
+        elif "protected_networks" in rule_details:
+            check_cls = ProtectedNetworkCheck
+        else:
+            check_cls = RiskCheck
+        checks.append(check_cls(rule_name, rule_details,
+                                evaluate_severity(rule_name, vendor),
+                                evaluate_category(rule_name, vendor)))
+    return tuple(checks)
+
+class RiskIndex:
+    """
+    Inverted index from (field, token code) and (field, whole value) to the positions
+    of the checks that care about it. A rule's tokens are looked up once and only the
+    candidate checks are evaluated, in config order.
+    """
+
+    def __init__(self, checks):
+        self.always = []
+        self.tokens = {}
+        self.values = {}
+        for pos, check in enumerate(checks):
+            anchors = check.anchors()
+            if anchors is None:
+                self.always.append(pos)
+                continue
+            for kind, field, keys in anchors:
+                table = (self.tokens if kind == "tokens" else self.values).setdefault(field, {})
+                for key in keys:
+                    table.setdefault(key, set()).add(pos)
+
+    def candidates(self, rule):
+        found = set(self.always)
+        for field, table in self.tokens.items():
+            for token in rule.tokens(field):
+                hit = table.get(token)
+                if hit:
+                    found |= hit
+        for field, table in self.values.items():
+            value = rule.dst_port if field == "dst_port" else rule.get(field, "")
+            hit = table.get(str(value).lower())
+            if hit:
+                found |= hit
+        return sorted(found)
+
+
+def risk_index(vendor=None):
+    index = RISK_INDEXES.get(vendor)
+    if index is None:
+        index = RISK_INDEXES[vendor] = RiskIndex(compiled_risk_rules(vendor))
+    return index
+
+def config_changed(changed):
+    """
+    Config listener: forget only what was built from the changed sections. Token
+    and address caches don't depend on the config and are kept.
+    """
+    if ("service_port_map",) in changed:
+        # Port lookups feed every compiled check
+        for cached in (service_port, service_ports, rule_ports):
+            cached.cache_clear()
+        stale = set(COMPILED_CHECKS)
+    else:
+        stale = {path[1] for path in changed if path[0] == "vendor_mappings" and path[2] == "risk_rules"}
+        if ("risk_rules",) in changed:
+            # Vendors without risk_rules of their own compile the global ones
+            vendors = get_config().data.get("vendor_mappings", {})
+            stale |= {vendor for vendor in COMPILED_CHECKS
+                      if not vendors.get(vendor, {}).get("risk_rules")}
+
+    for vendor in stale:
+        COMPILED_CHECKS.pop(vendor, None)
+        RISK_INDEXES.pop(vendor, None)
+
+on_change(config_changed)
+
+def check_rule(rule, vendor=None):
+    """Runs the vendor's compiled risk checks that the rule's tokens make candidates."""
+    if isinstance(rule, dict):
+        rule = Rule.from_dict(rule)
+
+    # ✅ Skip rules that are disabled in the CSV
+    if str(rule.status).lower() == "disable":
+        return []
 
+    checks = compiled_risk_rules(vendor)
+    findings = []
+    for pos in risk_index(vendor).candidates(rule):
+        findings.extend(checks[pos].evaluate(rule))
     return findings
 
-def run_checker(rules, vendor=None):
-    """Runs check_rule() on each parsed firewall rule."""
-    results = {}
+def iter_checker(rules, vendor=None):
+    """Streaming run_checker(): yields (index, findings) as each rule is checked."""
     for idx, rule in enumerate(rules, start=1):
         rule_vendor = rule.get("vendor", vendor)
-        results[idx] = check_rule(rule, rule_vendor)
-    return results
+        yield idx, check_rule(rule, rule_vendor)
+
+def run_checker(rules, vendor=None):
+    """Runs check_rule() on each parsed firewall rule."""
+    return dict(iter_checker(rules, vendor))
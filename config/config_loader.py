@@ -16,14 +16,188 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 
+import hashlib
 import json
 from pathlib import Path
 
+DEFAULT_PATH = "config/rules_config.json"
+
+
+
+def changed_sections(old, new):
+    """
+    Paths of the config sections that differ between two loads: top-level keys as
+    ("risk_rules",), vendor_mappings per vendor and key as
+    ("vendor_mappings", vendor, "risk_rules").
+    """
+    changed = set()
+    for key in old.keys() | new.keys():
+        if old.get(key) == new.get(key):
+            continue
+        if key != "vendor_mappings":
+            changed.add((key,))
+            continue
+        old_vendors, new_vendors = old.get(key, {}), new.get(key, {})
+        for vendor in old_vendors.keys() | new_vendors.keys():
+            old_entry, new_entry = old_vendors.get(vendor, {}), new_vendors.get(vendor, {})
+            for part in old_entry.keys() | new_entry.keys():
+                if old_entry.get(part) != new_entry.get(part):
+                    changed.add((key, vendor, part))
+    return changed
+
+
+# ---------------- Validation ----------------
+def expect(condition, where, message):
+    if not condition:
+        raise ValueError(f"{where} {message}")
+
+
+def is_text_list(value):
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+def validate_risk_rules(risk_rules, where):
+    expect(isinstance(risk_rules, dict), where, "must map rule names to objects")
+    for name, details in risk_rules.items():
+        rule_where = f"{where}.{name}"
+        expect(isinstance(details, dict), rule_where, "must be an object")
+        expect(isinstance(details.get("enabled", False), bool), f"{rule_where}.enabled", "must be true or false")
+        for key in ("match", "match_ports"):
+            criteria = details.get(key, {})
+            expect(isinstance(criteria, dict), f"{rule_where}.{key}", "must map fields to lists")
+            for field, values in criteria.items():
+                expect(is_text_list(values), f"{rule_where}.{key}.{field}", "must be a list of strings")
+        for key in ("values", "protected_networks", "fields", "action_scope"):
+            if key in details:
+                expect(is_text_list(details[key]), f"{rule_where}.{key}", "must be a list of strings")
+
+
+def validate(data):
+    """Raise ValueError naming the first malformed section."""
+    expect(isinstance(data, dict), "config", "must be a JSON object")
+    vendors = data.get("vendor_mappings", {})
+    expect(isinstance(vendors, dict), "vendor_mappings", "must map vendor names to objects")
+    for vendor, entry in vendors.items():
+        where = f"vendor_mappings.{vendor}"
+        expect(isinstance(entry, dict), where, "must be an object")
+        expect(is_text_list(entry.get("detect_headers_any", [])), f"{where}.detect_headers_any",
+               "must be a list of strings")
+        columns = entry.get("columns", {})
+        expect(isinstance(columns, dict), f"{where}.columns", "must map fields to lists of column names")
+        for field, aliases in columns.items():
+            expect(is_text_list(aliases), f"{where}.columns.{field}", "must be a list of column names")
+        normalization = entry.get("normalization", {})
+        expect(isinstance(normalization, dict), f"{where}.normalization", "must map fields to objects")
+        for field, table in normalization.items():
+            expect(isinstance(table, dict), f"{where}.normalization.{field}", "must map values to values")
+        if "risk_rules" in entry:
+            validate_risk_rules(entry["risk_rules"], f"{where}.risk_rules")
+    validate_risk_rules(data.get("risk_rules", {}), "risk_rules")
+    expect(isinstance(data.get("service_port_map", {}), dict), "service_port_map", "must map service names to ports")
+
+
+# ---------------- Compilation ----------------
+def json_digest(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def compile_config(data):
+    """
+    Resolve everything the parser and checker look up per file or per rule into
+    flat tables: lowercased column aliases, detection headers, normalization maps,
+    each vendor's effective risk_rules and (severity, category) per issue.
+    """
+    global_rules = data.get("risk_rules", {})
+    global_meta = {name: (details.get("severity", "UNKNOWN"), details.get("category", "Uncategorized"))
+                   for name, details in global_rules.items()}
+
+    vendors, risk_rules, rule_meta = {}, {None: global_rules}, {None: global_meta}
+    for vendor, entry in data.get("vendor_mappings", {}).items():
+        vendors[vendor] = {
+            "columns": {field: [alias.lower().strip() for alias in aliases]
+                        for field, aliases in entry.get("columns", {}).items()},
+            "headers": frozenset(h.lower() for h in entry.get("detect_headers_any", [])),
+            "normalization": entry.get("normalization", {}),
+            "digest": json_digest(entry),
+        }
+        # A vendor's own risk_rules replace the global ones entirely
+        own_rules = entry.get("risk_rules", {})
+        risk_rules[vendor] = own_rules or global_rules
+        rule_meta[vendor] = dict(global_meta)
+        rule_meta[vendor].update(
+            (name, (details.get("severity", "UNKNOWN"), details.get("category", "Uncategorized")))
+            for name, details in own_rules.items()
+        )
+
+    return {
+        "data": data,
+        "vendors": vendors,
+        "risk_rules": risk_rules,
+        "rule_meta": rule_meta,
+        "service_port_map": data.get("service_port_map", {}),
+        "digest": json_digest(data),
+        "empty_digest": json_digest({}),
+    }
+
+
 class Config:
-    def __init__(self, path="config/rules_config.json"):
+    def __init__(self, path=DEFAULT_PATH, listeners=None):
         self.path = Path(path)
-        with self.path.open("r", encoding="utf-8") as f:
-            self.data = json.load(f)
+        self.compiled = {"data": {}}
+        self.stamp = None    # (mtime_ns, size) of the loaded file
+        self.digest = None   # sha256 of the loaded bytes
+        self.listeners = []
+        self.load()
+        # Attached after the first load: listeners may call get_config(), which
+        # only returns this instance once the constructor is done
+        self.listeners = [] if listeners is None else listeners
+
+    @property
+    def data(self):
+        """The raw JSON document."""
+        return self.compiled["data"]
+
+    # ---- reloading ----
+    def load(self):
+        """
+        (Re)read the file when its mtime/size moved and its content hash changed.
+        The JSON is parsed, validated and compiled (about a millisecond, so the
+        compiled form isn't stored on disk). It is swapped in
+        with one assignment, then listeners get the changed section paths (see
+        changed_sections). Returns those paths; empty when unchanged.
+        """
+        stat = self.path.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self.stamp:
+            return set()
+
+        raw = self.path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        if digest == self.digest:
+            self.stamp = stamp
+            return set()
+
+        data = json.loads(raw)
+        validate(data)
+        compiled = compile_config(data)
+
+        changed = changed_sections(self.data, compiled["data"])
+        self.compiled, self.stamp, self.digest = compiled, stamp, digest
+        for listener in self.listeners:
+            listener(changed)
+        return changed
+
+    def refresh(self):
+        """load() for a running session: a missing, half-written or invalid file keeps the current config."""
+        try:
+            return self.load()
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Keeping the current configuration, {self.path} could not be reloaded: {e}")
+            return set()
+
+    def on_change(self, listener):
+        """Call listener(changed_paths) after every later reload that changed something."""
+        self.listeners.append(listener)
 
     # ---- sections ----
     def risk_rules(self):
@@ -32,15 +206,50 @@ class Config:
     def reporting_style(self):
         return self.data.get("reporting", {})
 
+    def data_digest(self):
+        """Hash of the parsed document (formatting-insensitive)."""
+        return self.compiled["digest"]
+
+    # ---- compiled lookups ----
+    def vendor_risk_rules(self, vendor=None):
+        """A vendor's risk_rules, or the global ones when the vendor has none."""
+        risk_rules = self.compiled["risk_rules"]
+        return risk_rules.get(vendor, risk_rules[None])
+
+    def severity(self, issue_type, vendor=None):
+        meta = self.compiled["rule_meta"]
+        return meta.get(vendor, meta[None]).get(issue_type, ("UNKNOWN", "Uncategorized"))[0]
+
+    def category(self, issue_type, vendor=None):
+        meta = self.compiled["rule_meta"]
+        return meta.get(vendor, meta[None]).get(issue_type, ("UNKNOWN", "Uncategorized"))[1]
+
+    def service_port_map(self):
+        return self.compiled["service_port_map"]
+
+    def columns(self, vendor):
+        """Lowercased column aliases per logical field; {} for unmapped vendors."""
+        entry = self.compiled["vendors"].get(vendor)
+        return entry["columns"] if entry else {}
+
+    def normalization(self, vendor):
+        """Value maps per field from the vendor's normalization block; {} when absent."""
+        entry = self.compiled["vendors"].get(vendor)
+        return entry["normalization"] if entry else {}
+
+    def mapping_digest(self, vendor):
+        """Hash of the vendor's vendor_mappings entry (parse cache key)."""
+        entry = self.compiled["vendors"].get(vendor)
+        return entry["digest"] if entry else self.compiled["empty_digest"]
+
     # ---- vendor helpers ----
     def vendor_keys(self):
         """Return all vendor names (e.g., 'fortinet', 'sophos')."""
-        return list(self.data["vendor_mappings"].keys())
+        return list(self.compiled["vendors"])
 
     def vendor_detection_headers(self, vendor):
         """Return set of headers used to auto-detect this vendor."""
-        vm = self.data["vendor_mappings"][vendor]
-        return set(h.lower() for h in vm.get("detect_headers_any", []))
+        return self.compiled["vendors"][vendor]["headers"]
 
     def vendor_column_aliases(self, vendor):
         """
@@ -55,7 +264,7 @@ class Config:
 
     # ---- NEW: helper for risk rating + comments ----
     # ---- These new vendor comments and risk ratings will be shown in the reports later ---
-    
+
     def vendor_extra_fields(self, vendor):
         """
         Return extra optional fields that can be merged later in reporting.
@@ -64,5 +273,25 @@ class Config:
         return self.data["vendor_mappings"][vendor].get("extra_fields", {})
 
 
-def load_config(path="config/rules_config.json"):
-    return Config(path)
+# ---------------- Shared instance ----------------
+# One Config per path for the whole process, created on first use rather than at
+# import. Listeners registered through on_change() outlive reloads.
+SHARED = {}
+LISTENERS = []
+
+
+def get_config(path=DEFAULT_PATH):
+    """The process-wide Config for path, loaded on first use."""
+    config = SHARED.get(path)
+    if config is None:
+        config = SHARED[path] = Config(path, LISTENERS)
+    return config
+
+
+def on_change(listener):
+    """Register listener(changed_paths) on the shared configs without loading them."""
+    LISTENERS.append(listener)
+
+
+def load_config(path=DEFAULT_PATH):
+    return get_config(path)
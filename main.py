@@ -18,15 +18,17 @@
 
 import argparse
 import os
-import sys
 import csv
-from config.config_loader import load_config
-from checker import rule_checker
-from parser_utils import rule_parser
-from report.pdf_report import PDFReport
+import importlib
+import itertools
+from config.config_loader import get_config
+from checker import delta_checker, policy_analyzer
+from checker.findings_table import FindingsTable
+from parser_utils import addresses, parse_cache, rule_parser, workbook
 
-import curses
-from file_browser.file_browser_with_subwindow import file_browser
+# Heavy dependencies load on the paths that use them: pandas/openpyxl in the frame
+# and XLSX readers, numpy in the columnar engine, fpdf/matplotlib/PIL for the PDF
+# report and curses for the file browser.
 
 
 def start_menu():
@@ -69,134 +71,312 @@ def post_run_menu():
             print("Invalid choice, please enter 1 or 2.")
 
 
+def browse_file():
+    """Pick a file in the curses browser; None when cancelled."""
+    import curses
+    from file_browser.file_browser_with_subwindow import file_browser
 
+    return curses.wrapper(file_browser, os.getcwd())
 
-def export_findings_to_csv(results, output_path):
-    """Writes findings dictionary to a CSV file."""
+
+def export_findings_to_csv(table, output_path):
+    """Writes every rule of a FindingsTable to a CSV file."""
+    stream_findings_to_csv(table, range(table.rule_count), output_path)
+
+
+def stream_findings_to_csv(table, positions, output_path):
+    """Writes the table's rules at positions to a CSV file as they are checked."""
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
     with open(output_path, mode="w", newline="", encoding="utf-8") as csvfile:
-        fieldnames = ["rule_id", "issue", "field", "value", "severity", "category"]
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-
-        for rule_id, findings in results.items():
-            if not findings:
-                writer.writerow({
-                    "rule_id": rule_id,
-                    "issue": "No issues found",
-                    "field": "-",
-                    "value": "-",
-                    "severity": "",
-                    "category": "-"
-                })
-            else:
-                for finding in findings:
-                    writer.writerow({
-                        "rule_id": rule_id,
-                        "issue": finding["issue"],
-                        "field": finding.get("field", "-"),
-                        "value": finding.get("value", "-"),
-                        "severity": finding["severity"],
-                        "category": finding.get("category", "-")
-                    })
+        writer = csv.writer(csvfile)
+        writer.writerow(["rule_id", "issue", "field", "value", "severity", "category"])
+        for pos in positions:
+            writer.writerows(table.rows([pos]))
 
     print(f"\n Technical findings exported to {output_path}")
 
 
-def export_findings_to_pdf(results, file_path, output_pdf, vendor=None):
-    """Generate PDF report from findings."""
-    findings = []
-    severity_count = {}
-    category_count = {}
-
-    for rid, issues in results.items():
-        if not issues:
-            findings.append({
-                "rule_id": rid,
-                "issue_type": "No issues found",
-                "field": "-",
-                "value": "-",
-                "severity": "INFO",
-                "category": "-"
+def export_delta_to_csv(rows, output_path):
+    """Writes (status, rule_id, finding) rows of a delta run to a CSV file."""
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+    with open(output_path, mode="w", newline="", encoding="utf-8") as csvfile:
+        fieldnames = ["status", "rule_id", "issue", "field", "value", "severity", "category"]
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer.writeheader()
+
+        for status, rule_id, finding in rows:
+            writer.writerow({
+                "status": status,
+                "rule_id": rule_id,
+                "issue": finding["issue"],
+                "field": finding.get("field", "-"),
+                "value": finding.get("value", "-"),
+                "severity": finding["severity"],
+                "category": finding.get("category", "-")
             })
-            severity_count["INFO"] = severity_count.get("INFO", 0) + 1
-        else:
-            for f in issues:
-                findings.append({
-                    "rule_id": rid,
-                    "issue_type": f.get("issue", ""),
-                    "field": f.get("field", "-"),
-                    "value": f.get("value", "-"),
-                    "severity": f.get("severity", "UNKNOWN"),
-                    "category": f.get("category", "-")
-                })
-                sev = f["severity"].upper()
-                severity_count[sev] = severity_count.get(sev, 0) + 1
-                cat = f.get("category", "-")
-                category_count[cat] = category_count.get(cat, 0) + 1
-
-    total_rules = len(results)
-    total_risks = sum(1 for f in findings if f["issue_type"] != "No issues found")
+
+    print(f" Delta findings exported to {output_path}")
+
+
+def print_findings(table, pos):
+    """Print the findings of the table's rule at pos to the console."""
+    rule_id, findings = table.rule_ids[pos], table.findings(pos)
+    if findings:
+        print(f"\nRule: {rule_id}")
+        for issue, field, value, severity, category in findings:
+            print(f"  - [{severity}] {issue} (Field: {field} | Value: {value} | Category: {category})")
+    else:
+        print(f"\nRule: {rule_id} - No issues found")
+
+
+# --engine choices -> checker module: per-rule loop (streams), columnar masks, or the
+# per-rule loop across a process pool (both of the latter check the whole list at once).
+# Modules are imported on first use, so numpy only loads for the columnar engine.
+CHECK_ENGINES = {
+    "rows": "checker.rule_checker",
+    "columnar": "checker.columnar_checker",
+    "parallel": "checker.parallel_checker",
+}
+
+
+def check_rules(rules, table, sheet=None, engine="rows", workers=None, policy=None):
+    """
+    Check rules and add them to a FindingsTable; yields each rule's table position.
+    policy holds analyze_policy() findings to append per rule. With sheet set, rule
+    ids are tagged with the worksheet name.
+    """
+    checker = importlib.import_module(CHECK_ENGINES[engine])
+    if engine == "parallel":
+        checked = checker.iter_checker(rules, workers=workers)
+    else:
+        checked = checker.iter_checker(rules)
+
+    for rule_id, findings in checked:
+        if policy and rule_id in policy:
+            findings = findings + policy[rule_id]
+        if sheet:
+            rule_id = f"{sheet}:{rule_id}"
+        yield table.add(rule_id, findings)
+
+
+def check_and_print(rules, table, sheet=None, engine="rows", workers=None, policy=None):
+    """check_rules() echoing each rule's findings as it is added."""
+    for pos in check_rules(rules, table, sheet, engine, workers, policy):
+        print_findings(table, pos)
+        yield pos
+
+
+def export_findings_to_pdf(table, file_path, output_pdf, vendor=None, csv_path=None, max_findings=None):
+    """
+    Generate PDF report from a FindingsTable. Past max_findings the findings table
+    is summarized per issue and points at csv_path for the full list.
+    """
+    from report.pdf_report import PDFReport
 
     pdf = PDFReport()
     pdf.add_page()
-    pdf.add_summary(os.path.basename(file_path), total_rules, total_risks, severity_count, vendor)
-    pdf.add_charts(severity_count, category_count)
-    
-    pdf.add_table(findings)
+    pdf.add_summary(os.path.basename(file_path), table.rule_count, len(table), table.severity_count, vendor)
+    pdf.add_charts(table.severity_count, table.category_count)
+
+    pdf.add_table(table, max_findings, csv_path)
     pdf.output(output_pdf)
 
     print(f" PDF report exported to {output_pdf}")
 
 
-def process_file(file_path, vendor=None):
+def refresh_config():
+    """Pick up edits to rules_config.json made since the last file was processed."""
+    changed = get_config().refresh()
+    if changed:
+        print(f" Configuration reloaded: {', '.join(sorted('/'.join(path) for path in changed))}")
+
+
+def output_paths(file_path):
+    """Return the (csv, pdf) report paths for an input file."""
+    base_name = os.path.splitext(os.path.basename(file_path))[0]
+    csv_path = os.path.join("output", f"{base_name}_findings.csv")
+    pdf_path = os.path.join("output", f"{base_name}_report.pdf")
+    return csv_path, pdf_path
+
+
+def policy_sheets(file_path, vendor):
+    """
+    (sheet index, sheet name) of each policy sheet of a workbook, [(0, None)] for other
+    files, or None when the workbook can't be read. A lone policy sheet is read
+    wherever it sits in the workbook.
+    """
+    if not (vendor and file_path.endswith(".xlsx")):
+        return [(0, None)]
+    try:
+        sheets = rule_parser.find_xlsx_policy_sheets(file_path, vendor)
+    except Exception as e:
+        print(f"Error reading workbook: {e}")
+        return None
+    return sheets or [(0, None)]
+
+
+def process_file(file_path, vendor=None, use_cache=True, engine="rows", workers=None, max_pdf_findings=None):
+    refresh_config()
     vendor = vendor.lower() if vendor else rule_parser.detect_vendor(file_path)
     print(f"\n File Provided: {os.path.basename(file_path)}")
     print(f" Vendor Detected: {vendor}")
 
-    try:
-        rules = rule_parser.parse_file(file_path, vendor=vendor)
-    except Exception as e:
-        print(f"Error parsing file: {e}")
+    # Workbooks carrying one policy per sheet are parsed sheet-by-sheet in parallel
+    sheets = policy_sheets(file_path, vendor)
+    if sheets is None:
         return
+    if len(sheets) > 1:
+        process_workbook(file_path, vendor, sheets, use_cache, engine, workers, max_pdf_findings)
+        return
+    sheet_index = sheets[0][0]
 
-    if not rules:
+    # Rules stream through parse -> check -> CSV; unchanged inputs come from the parse cache
+    rules = parse_cache.iter_rules(file_path, vendor=vendor, use_cache=use_cache, sheet_index=sheet_index)
+    first_rule = next(rules, None)
+    if first_rule is None:
         print("No rules found in the file.")
         return
+    rules = itertools.chain([first_rule], rules)
 
-    results = rule_checker.run_checker(rules)
+    csv_path, pdf_path = output_paths(file_path)
 
     print("\n Risk Analysis Results:")
-    for rule_id, findings in results.items():
-        if findings:
-            print(f"\nRule: {rule_id}")
-            for finding in findings:
-                print(
-                    f"  - [{finding['severity']}] {finding['issue']} "
-                    f"(Field: {finding.get('field','-')} | "
-                    f"Value: {finding.get('value','-')} | "
-                    f"Category: {finding.get('category','-')})"
-                )
-        else:
-            print(f"\nRule: {rule_id} - No issues found")
+    table = FindingsTable()
+    if policy_analyzer.policy_issues(vendor):
+        # Shadowed/redundant/conflicting rules need the whole policy: rule ids, actions
+        # and spaces are kept as the rules are checked, and the findings merged after
+        policy = policy_analyzer.PolicySpaces(vendor)
+        for _ in check_rules(policy.observe(rules), table, engine=engine, workers=workers):
+            pass
+        table.merge({idx - 1: findings for idx, findings in policy.findings().items()})
+        for pos in range(table.rule_count):
+            print_findings(table, pos)
+        export_findings_to_csv(table, csv_path)
+    else:
+        stream_findings_to_csv(table, check_and_print(rules, table, engine=engine, workers=workers), csv_path)
+    export_findings_to_pdf(table, file_path, pdf_path, vendor, csv_path, max_pdf_findings)
+
+
+def process_delta(previous_file, file_path, vendor=None, use_cache=True, max_pdf_findings=None):
+    """Compare file_path with an earlier export of the same firewall; only changed rules are re-checked."""
+    refresh_config()
+    vendor = vendor.lower() if vendor else rule_parser.detect_vendor(file_path)
+    print(f"\n File Provided: {os.path.basename(file_path)}")
+    print(f" Baseline: {os.path.basename(previous_file)}")
+    print(f" Vendor Detected: {vendor}")
 
-    base_name = os.path.splitext(os.path.basename(file_path))[0]
-    csv_path = os.path.join("output", f"{base_name}_findings.csv")
-    pdf_path = os.path.join("output", f"{base_name}_report.pdf")
+    current, counts, rows, checked = delta_checker.run_delta(previous_file, file_path, vendor, use_cache)
+    if not current:
+        print("No rules found in the file.")
+        return
 
-    export_findings_to_csv(results, csv_path)
-    export_findings_to_pdf(results, file_path, pdf_path, vendor)
+    print(f"\n Rules: {counts['added']} added, {counts['modified']} modified, "
+          f"{counts['unchanged']} unchanged, {counts['removed']} removed "
+          f"({checked} of {len(current)} re-checked)")
+
+    status_count = {}
+    for status, rule_id, finding in rows:
+        status_count[status] = status_count.get(status, 0) + 1
+        if status != "persisting":
+            print(f"  {status.upper():9} Rule {rule_id}: [{finding['severity']}] {finding['issue']} "
+                  f"(Field: {finding.get('field','-')} | Value: {finding.get('value','-')})")
+    print(f" Findings: {status_count.get('new', 0)} new, {status_count.get('resolved', 0)} resolved, "
+          f"{status_count.get('persisting', 0)} persisting")
+
+    csv_path, pdf_path = output_paths(file_path)
+    delta_path = os.path.join("output", f"{os.path.splitext(os.path.basename(file_path))[0]}_delta.csv")
+    table = FindingsTable()
+    for idx, (_, _, findings) in enumerate(current, start=1):
+        table.add(idx, findings)
+    export_findings_to_csv(table, csv_path)
+    export_delta_to_csv(rows, delta_path)
+    export_findings_to_pdf(table, file_path, pdf_path, vendor, csv_path, max_pdf_findings)
+
+
+def process_exposure(file_path, network, vendor=None, use_cache=True):
+    """List the enabled allow rules whose destination reaches network."""
+    refresh_config()
+    vendor = vendor.lower() if vendor else rule_parser.detect_vendor(file_path)
+    print(f"\n File Provided: {os.path.basename(file_path)}")
+    print(f" Vendor Detected: {vendor}")
+
+    intervals = addresses.parse_address(network)
+    if not intervals:
+        print(f"❌ Not an address, network or range: {network}")
+        return
+
+    sheets = policy_sheets(file_path, vendor)
+    if sheets is None:
+        return
+    if len(sheets) > 1:
+        print(f" Policy Sheets: {', '.join(name for _, name in sheets)}")
+        parsed = workbook.parse_sheets(file_path, vendor, sheets, use_cache)
+    else:
+        parsed = [(None, parse_cache.iter_rules(file_path, vendor=vendor, use_cache=use_cache,
+                                                sheet_index=sheets[0][0]))]
+
+    # Rule ids are tagged with the worksheet name, as in the findings of a workbook
+    rules, rule_ids = [], []
+    for sheet, sheet_rules in parsed:
+        for rule in sheet_rules:
+            if str(rule.status).lower() != "disable" and str(rule.action).lower() in ("accept", "allow"):
+                rules.append(rule)
+                rule_ids.append(f"{sheet}:{rule.id}" if sheet else rule.id)
+    index = addresses.rule_index(rules)
+    exposing = sorted({pos for interval in intervals for pos in index.overlapping(interval)})
+
+    print(f"\n Rules exposing {network}: {len(exposing)} of {len(rules)} enabled allow rules")
+    for pos in exposing:
+        rule = rules[pos]
+        print(f"  Rule {rule_ids[pos]}: {rule.name} | {rule.srcaddr_text} -> {rule.dstaddr_text} | {rule.service_text}")
+
+
+def process_workbook(file_path, vendor, sheets, use_cache=True, engine="rows", workers=None, max_pdf_findings=None):
+    """Parse every policy sheet in a process pool and produce one combined report."""
+    print(f" Policy Sheets: {', '.join(name for _, name in sheets)}")
+
+    parsed = list(workbook.parse_sheets(file_path, vendor, sheets, use_cache))
+    if not any(rules for _, rules in parsed):
+        print("No rules found in the file.")
+        return
+
+    csv_path, pdf_path = output_paths(file_path)
+
+    print("\n Risk Analysis Results:")
+    table = FindingsTable()
+    checked = itertools.chain.from_iterable(
+        check_and_print(rules, table, sheet, engine, workers, policy_analyzer.analyze_policy(rules, vendor, sheet))
+        for sheet, rules in parsed
+    )
+    stream_findings_to_csv(table, checked, csv_path)
+    export_findings_to_pdf(table, file_path, pdf_path, vendor, csv_path, max_pdf_findings)
 
 
 def main():
     parser_args = argparse.ArgumentParser(description="Firewall Risk Identification Tool - FireFind")
     parser_args.add_argument("-f", "--file", help="Path to vendor file (CSV/XLSX)")
     parser_args.add_argument("-v", "--vendor", help="Vendor name (optional, auto-detect)")
+    parser_args.add_argument("--no-cache", action="store_true", help="Always re-parse the file, bypassing the parse cache")
+    parser_args.add_argument("--engine", choices=sorted(CHECK_ENGINES), default="rows",
+                             help="Rule checker: per-rule loop (rows), vectorized columnar masks, or a process pool (parallel)")
+    parser_args.add_argument("--workers", type=int, help="Worker processes for --engine parallel (default: CPU count)")
+    parser_args.add_argument("-b", "--baseline", help="Previous export of the same firewall; with -f only changed rules are re-checked")
+    parser_args.add_argument("--max-pdf-findings", type=int, metavar="N",
+                             help="Findings listed in the PDF table before the rest are counted per issue (default: 5000)")
+    parser_args.add_argument("-x", "--exposes", metavar="NETWORK", help="With -f, list the allow rules whose destination reaches this address/CIDR")
     args = parser_args.parse_args()
 
     if args.file:
-        process_file(args.file, args.vendor)
+        if args.exposes:
+            process_exposure(args.file, args.exposes, args.vendor, use_cache=not args.no_cache)
+        elif args.baseline:
+            process_delta(args.baseline, args.file, args.vendor, use_cache=not args.no_cache,
+                          max_pdf_findings=args.max_pdf_findings)
+        else:
+            process_file(args.file, args.vendor, use_cache=not args.no_cache, engine=args.engine, workers=args.workers,
+                         max_pdf_findings=args.max_pdf_findings)
         # After processing a direct file, offer next actions without the welcome banner
         while True:
             next_action = post_run_menu()
@@ -205,13 +385,14 @@ def main():
                 return
             # browse again
             try:
-                file_path = curses.wrapper(file_browser, os.getcwd())
+                file_path = browse_file()
             except Exception as e:
                 print(f"File browser error: {e}")
                 continue
             if file_path is None:
                 continue
-            process_file(file_path, None)
+            process_file(file_path, None, use_cache=not args.no_cache, engine=args.engine, workers=args.workers,
+                         max_pdf_findings=args.max_pdf_findings)
         
     # Interactive mode: show the welcome banner once
     while True:
@@ -221,7 +402,7 @@ def main():
             return
         elif user_choice == "browse":
             try:
-                file_path = curses.wrapper(file_browser, os.getcwd())
+                file_path = browse_file()
             except Exception as e:
                 print(f"File browser error: {e}")
                 continue
@@ -229,7 +410,8 @@ def main():
             if file_path is None:
                 continue
 
-            process_file(file_path, args.vendor)
+            process_file(file_path, args.vendor, use_cache=not args.no_cache, engine=args.engine, workers=args.workers,
+                         max_pdf_findings=args.max_pdf_findings)
             args.vendor = None
             
             # After processing, do not show the welcome banner again; show post-run menu
@@ -240,13 +422,14 @@ def main():
                     return
                 # browse again
                 try:
-                    file_path = curses.wrapper(file_browser, os.getcwd())
+                    file_path = browse_file()
                 except Exception as e:
                     print(f"File browser error: {e}")
                     break
                 if file_path is None:
                     continue
-                process_file(file_path, None)
+                process_file(file_path, None, use_cache=not args.no_cache, engine=args.engine, workers=args.workers,
+                             max_pdf_findings=args.max_pdf_findings)
 
 
 if __name__ == "__main__":
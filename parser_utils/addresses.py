@@ -0,0 +1,160 @@
+# This file is part of FireFind Project.
+#
+# Copyright (C) 2025 Your Name
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import ipaddress
+import re
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from operator import itemgetter
+
+from parser_utils.symbols import SYMBOLS
+
+# IPv4 addresses live in the IPv4-mapped block (::ffff:0:0/96), so IPv4 and IPv6
+# ranges share one integer line and one index
+V4_BASE = 0xFFFF << 32
+V4_SIZE = 1 << 32
+FULL_RANGE = (0, (1 << 128) - 1)
+
+# Tokens meaning "every address"
+ANY_TOKENS = frozenset(["any", "all"])
+
+# Object names that carry their address, e.g. "private-range-a_10.0.0.0/8"
+EMBEDDED_ADDRESS = re.compile(r"_(\d{1,3}(?:\.\d{1,3}){3}(?:/\d{1,2})?)$")
+
+# Plain IPv4 host or CIDR, parsed without ipaddress (the common case, and ~10x cheaper)
+IPV4_CIDR = re.compile(r"(\d{1,3})\.(\d{1,3})\.(\d{1,3})\.(\d{1,3})(?:/(\d{1,2}))?$")
+
+
+def network_interval(text):
+    """'10.0.0.0/8', '10.0.0.1', '2001:db8::/32' or '10.0.0.0/255.0.0.0' -> (lo, hi)."""
+    match = IPV4_CIDR.match(text)
+    if match:
+        a, b, c, d, prefix = match.groups()
+        prefix = 32 if prefix is None else int(prefix)
+        if max(int(a), int(b), int(c), int(d)) > 255 or prefix > 32:
+            raise ValueError(f"not an IPv4 network: {text}")
+        host_bits = 32 - prefix
+        lo = (int(a) << 24 | int(b) << 16 | int(c) << 8 | int(d)) >> host_bits << host_bits
+        return V4_BASE + lo, V4_BASE + lo + (1 << host_bits) - 1
+
+    network = ipaddress.ip_network(text, strict=False)
+    lo, hi = int(network.network_address), int(network.broadcast_address)
+    if network.version == 4:
+        lo, hi = lo + V4_BASE, hi + V4_BASE
+    return lo, hi
+
+
+def parse_address(text):
+    """
+    Integer intervals of one address token: a host, CIDR network, 'a-b' range,
+    any/all, or an object name ending in _<address>. Other object names give ().
+    """
+    text = text.strip().lower()
+    if text in ANY_TOKENS:
+        return (FULL_RANGE,)
+
+    embedded = EMBEDDED_ADDRESS.search(text)
+    if embedded:
+        text = embedded.group(1)
+
+    try:
+        if "-" in text and "/" not in text:
+            first, last = (network_interval(part) for part in text.split("-", 1))
+            if first[0] <= last[1]:
+                return ((first[0], last[1]),)
+            return ()
+        return (network_interval(text),)
+    except ValueError:
+        return ()
+
+
+@lru_cache(maxsize=65536)
+def code_intervals(code):
+    """parse_address() of a token code."""
+    return parse_address(SYMBOLS.text(code))
+
+
+def is_ipv4(interval):
+    lo, hi = interval
+    return lo >= V4_BASE and hi < V4_BASE + V4_SIZE
+
+
+def prefix_length(interval):
+    """CIDR prefix of an interval; ranges that aren't a single network round down to a power of two."""
+    lo, hi = interval
+    bits = 32 if is_ipv4(interval) else 128
+    return bits - ((hi - lo + 1).bit_length() - 1)
+
+
+def overlaps(a, b):
+    return a[0] <= b[1] and b[0] <= a[1]
+
+
+def contains(outer, inner):
+    return outer[0] <= inner[0] and inner[1] <= outer[1]
+
+
+class IntervalIndex:
+    """
+    Sorted index of (interval, value) pairs. Intervals are bucketed by width
+    (bit length of hi - lo) and each bucket is sorted by start, so an interval
+    of a bucket can only reach a query if it starts within one bucket width of
+    it: a lookup is one bisect per bucket (at most 129) plus the hits.
+    """
+
+    def __init__(self, items):
+        buckets = {}
+        for (lo, hi), value in items:
+            buckets.setdefault((hi - lo).bit_length(), []).append((lo, hi, value))
+
+        self.buckets = []
+        for width, entries in sorted(buckets.items()):
+            entries.sort(key=itemgetter(0))
+            self.buckets.append((1 << width, [lo for lo, _, _ in entries], entries))
+
+    def __len__(self):
+        return sum(len(entries) for _, _, entries in self.buckets)
+
+    def overlapping(self, interval):
+        """Values whose interval shares at least one address with interval."""
+        lo, hi = interval
+        for span, starts, entries in self.buckets:
+            start, stop = bisect_left(starts, lo - span + 1), bisect_right(starts, hi)
+            for entry_lo, entry_hi, value in entries[start:stop]:
+                if entry_hi >= lo:
+                    yield value
+
+    def containing(self, interval):
+        """Values whose interval covers all of interval."""
+        lo, hi = interval
+        for span, starts, entries in self.buckets:
+            if span <= hi - lo:
+                continue
+            start, stop = bisect_left(starts, lo - span + 1), bisect_right(starts, lo)
+            for entry_lo, entry_hi, value in entries[start:stop]:
+                if entry_hi >= hi:
+                    yield value
+
+
+def rule_index(rules, fields=("dstaddr", "dst_address")):
+    """IntervalIndex of every address interval of the given fields -> rule position."""
+    return IntervalIndex(
+        (interval, pos)
+        for pos, rule in enumerate(rules)
+        for field in fields
+        for interval in rule.intervals(field)
+    )
@@ -0,0 +1,62 @@
+# This file is part of FireFind Project.
+#
+# Copyright (C) 2025 Your Name
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import csv
+
+
+def is_wrapped_row(line):
+    """
+    True when a whole CSV row was saved inside the first cell, e.g.
+    "1,Allow_Web,""Internal_Net"",...",,,,,,,
+    """
+    text = line.strip().rstrip(",")
+    return len(text) > 1 and text.startswith('"') and text.endswith('"') and "," in text[1:-1]
+
+
+def unwrap_row(line):
+    """Drop the outer cell quoting so the inner row can be tokenized directly."""
+    text = line.strip().rstrip(",")
+    return text[1:-1].replace('""', '"')
+
+
+def iter_physical_rows(f):
+    """Yield raw rows, joining lines while a quoted cell spans a line break."""
+    pending = ""
+    for line in f:
+        pending += line
+        if pending.count('"') % 2 == 0:
+            yield pending
+            pending = ""
+    if pending:
+        yield pending
+
+
+def iter_checkpoint_rows(file_path):
+    """
+    Stream Check Point rows as field lists (header skipped). The quoted-row-in-a-cell
+    layout is detected once from the header, then each line is tokenized a single time.
+    """
+    with open(file_path, "r", encoding="utf-8-sig", newline="") as f:
+        lines = iter_physical_rows(f)
+        header = next(lines, None)
+        if header is None:
+            return
+
+        if is_wrapped_row(header):
+            lines = (unwrap_row(line) for line in lines if is_wrapped_row(line))
+
+        yield from csv.reader(lines, delimiter=",", quotechar='"')
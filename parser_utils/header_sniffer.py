@@ -0,0 +1,98 @@
+# This file is part of FireFind Project.
+#
+# Copyright (C) 2025 Your Name
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import csv
+import re
+
+SNIFF_BYTES = 8192
+SNIFF_ROWS = 20
+
+# Keys of JSON-in-CSV exports (Sophos), e.g. "services": [...]
+JSON_KEY = re.compile(r'"([A-Za-z_][\w \-]*)"\s*:')
+
+
+def sample_csv_rows(file_path, max_bytes=SNIFF_BYTES, max_rows=SNIFF_ROWS):
+    """Return header candidates from the first max_bytes of a CSV file."""
+    with open(file_path, "rb") as f:
+        head = f.read(max_bytes)
+
+    text = head.decode("utf-8-sig", errors="replace")
+    lines = text.splitlines()
+    if len(head) == max_bytes and lines:
+        lines = lines[:-1]  # drop the partial last line
+
+    rows, json_keys = [], []
+    try:
+        for row in csv.reader(lines[:max_rows]):
+            cells = [c for c in row if c.strip()]
+            # Check Point style: a whole row quoted into the first cell
+            if len(cells) == 1 and "," in cells[0]:
+                cells = next(csv.reader([cells[0]]))
+            rows.append(cells)
+            json_keys.extend(key for cell in cells for key in JSON_KEY.findall(cell))
+    except csv.Error:
+        pass
+
+    # Keys of JSON objects stored in cells count as one header row
+    rows.append(json_keys)
+    return rows
+
+
+def sample_xlsx_rows(file_path, max_rows=SNIFF_ROWS):
+    """Return the first max_rows rows of sheet 0, read in read-only mode."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        return [[c for c in row if c is not None] for row in sheet.iter_rows(max_row=max_rows, values_only=True)]
+    finally:
+        workbook.close()
+
+
+def score_headers(rows, expected):
+    """Best fraction of expected headers found in any single sampled row."""
+    if not expected:
+        return 0.0
+    best = 0.0
+    for row in rows:
+        cells = {str(c).strip().lower() for c in row}
+        best = max(best, len(expected & cells) / len(expected))
+    return best
+
+
+def sniff_vendor(file_path, vendor_headers):
+    """
+    Score the file's first rows against every vendor's detect_headers_any.
+    Returns (vendor, confidence) for the best match, or (None, 0.0).
+    """
+    lower = file_path.lower()
+    if lower.endswith(".xlsx"):
+        rows = sample_xlsx_rows(file_path)
+    elif lower.endswith(".csv"):
+        rows = sample_csv_rows(file_path)
+    else:
+        return None, 0.0
+
+    best_vendor, best_score = None, 0.0
+    for vendor, expected in vendor_headers.items():
+        score = score_headers(rows, expected)
+        # On equal scores prefer the vendor whose header set is more specific
+        if score > best_score or (score == best_score and score and len(expected) > len(vendor_headers[best_vendor])):
+            best_vendor, best_score = vendor, score
+
+    return best_vendor, best_score
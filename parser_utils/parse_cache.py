@@ -0,0 +1,239 @@
+# This file is part of FireFind Project.
+#
+# Copyright (C) 2025 Your Name
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import hashlib
+import json
+import os
+
+from config.config_loader import get_config
+from parser_utils import rule_columns, rule_parser
+from parser_utils.rule_model import Rule
+
+CACHE_DIR = "cache"
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+# Entries evict() manages: parsed rules, and checker.delta_checker findings snapshots
+CACHE_SUFFIXES = (".rules", ".findings")
+
+# Bump when the parsers change the shape or content of the rules they produce
+CACHE_VERSION = "6"
+
+# Entries are a JSON header line, then per CHUNK_RULES rules a JSON line with the
+# rule_columns layout followed by its raw column buffers and a newline, then a
+# {"rules": count} trailer line. Nothing in it is unpickled, so a planted cache file can't run code.
+CACHE_FORMAT = "firefind-rules"
+CHUNK_RULES = 10000
+TRAILER_BYTES = 256
+
+
+def file_digest(file_path):
+    """SHA-256 of the file content, read in blocks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_key(file_path, vendor, sheet_index=0):
+    """Key on file content, sheet, vendor and that vendor's vendor_mappings entry."""
+    mapping_digest = get_config().mapping_digest(vendor)
+
+    key = f"{CACHE_VERSION}:{file_digest(file_path)}:{sheet_index}:{vendor}:{mapping_digest}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def cache_path(key, cache_dir=CACHE_DIR):
+    return os.path.join(cache_dir, f"{key}.rules")
+
+
+def cache_header():
+    return {"format": CACHE_FORMAT, "version": CACHE_VERSION, "columns": list(Rule.__slots__)}
+
+
+def write_record(f, record):
+    f.write(json.dumps(record, separators=(",", ":")).encode("utf-8"))
+    f.write(b"\n")
+
+
+def read_chunks(f):
+    with f:
+        while True:
+            layout = json.loads(f.readline())
+            if "slots" not in layout:  # trailer
+                return
+            data = f.read(layout["size"] + 1)
+            if len(data) != layout["size"] + 1 or data[-1:] != b"\n":
+                raise ValueError("truncated parse cache entry")
+            yield from rule_columns.unpack_rules(memoryview(data)[:-1], layout)
+
+
+def load_rules(key, cache_dir=CACHE_DIR):
+    """
+    Return (number of rules, iterator of rules) cached for key, or None on a miss.
+    The header and trailer are checked up front; chunks are read as they're consumed.
+    """
+    path = cache_path(key, cache_dir)
+    try:
+        f = open(path, "rb")
+    except OSError:
+        return None
+    try:
+        if json.loads(f.readline()) != cache_header():
+            raise ValueError("stale or foreign cache entry")
+        start = f.tell()
+        f.seek(max(start, os.fstat(f.fileno()).st_size - TRAILER_BYTES))
+        count = json.loads(f.read().splitlines()[-1])["rules"]
+        f.seek(start)
+        os.utime(path)  # mark as recently used for LRU eviction
+    except (OSError, ValueError, KeyError, TypeError, IndexError):
+        f.close()
+        return None
+    return count, read_chunks(f)
+
+
+class EntryWriter:
+    """
+    One cache entry written a chunk at a time as rules stream past. Nothing appears
+    under the key until commit(); after a write error the entry is dropped with a
+    warning and the rules keep streaming uncached.
+    """
+
+    def __init__(self, key, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.path = cache_path(key, cache_dir)
+        self.tmp_path = f"{self.path}.tmp"
+        self.file = None
+        self.failed = False
+        self.pending = []
+        self.count = 0
+
+    def add(self, rule):
+        """Queue one rule."""
+        if self.failed:
+            return
+        self.pending.append(rule)
+        if len(self.pending) >= CHUNK_RULES:
+            self.guarded(self.flush)
+
+    def flush(self):
+        if self.file is None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self.file = open(self.tmp_path, "wb")
+            write_record(self.file, cache_header())
+        if self.pending:
+            # Token codes are per process, so each chunk carries its own symbol table
+            layout, parts = rule_columns.pack_rules(self.pending, own_symbols=True)
+            write_record(self.file, layout)
+            for part in parts:
+                self.file.write(part)
+            self.file.write(b"\n")
+            self.count += len(self.pending)
+            self.pending = []
+
+    def publish(self):
+        self.flush()
+        write_record(self.file, {"rules": self.count})
+        self.file.close()
+        self.file = None
+        os.replace(self.tmp_path, self.path)
+        evict(self.cache_dir, self.max_bytes)
+
+    def commit(self):
+        """Publish the entry, then evict least recently used entries over max_bytes."""
+        if not self.failed and (self.count or self.pending):
+            self.guarded(self.publish)
+        self.discard()
+
+    def discard(self):
+        """Drop a partly written entry."""
+        self.pending = []
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+            try:
+                os.remove(self.tmp_path)
+            except OSError:
+                pass
+
+    def guarded(self, write):
+        try:
+            write()
+        except (OSError, TypeError, ValueError) as e:
+            print(f"⚠️ Could not write parse cache: {e}")
+            self.failed = True
+            self.discard()
+
+
+def store_rules(key, rules, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+    """Store an iterable of rules under key in one go."""
+    writer = EntryWriter(key, cache_dir, max_bytes)
+    for rule in rules:
+        writer.add(rule)
+    writer.commit()
+
+
+def evict(cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+    """Delete least recently used cache entries until the directory fits in max_bytes."""
+    entries = []
+    for name in os.listdir(cache_dir):
+        if name.endswith(CACHE_SUFFIXES):
+            stat = os.stat(os.path.join(cache_dir, name))
+            entries.append((stat.st_mtime, stat.st_size, name))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, name in sorted(entries):
+        if total <= max_bytes:
+            break
+        os.remove(os.path.join(cache_dir, name))
+        total -= size
+
+
+def iter_rules(file_path, vendor=None, use_cache=True, sheet_index=0, strict=False):
+    """
+    parse_file_iter() with a content-addressed cache in front of it. A hit skips
+    the parser entirely; a miss streams from the parser and stores the result.
+    With strict=True parse errors are raised instead of printed.
+    """
+    vendor = vendor or rule_parser.detect_vendor(file_path)
+    if not use_cache or not vendor:
+        yield from rule_parser.parse_file_iter(file_path, vendor, strict=strict, sheet_index=sheet_index)
+        return
+
+    key = cache_key(file_path, vendor, sheet_index)
+    cached = load_rules(key)
+    if cached is not None:
+        count, rules = cached
+        print(f"✅ Loaded {count} rules from parse cache")
+        yield from rules
+        return
+
+    writer = EntryWriter(key)
+    try:
+        for rule in rule_parser.parse_file_iter(file_path, vendor, strict=True, sheet_index=sheet_index):
+            writer.add(rule)
+            yield rule
+    except Exception as e:
+        writer.discard()  # never cache a partial parse
+        if strict:
+            raise
+        print(f"❌ Error parsing file: {e}")
+        return
+    except GeneratorExit:
+        writer.discard()
+        raise
+    writer.commit()
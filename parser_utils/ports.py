@@ -0,0 +1,159 @@
+# This file is part of FireFind Project.
+#
+# Copyright (C) 2025 Your Name
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import re
+
+from parser_utils.ranges import RangeSet
+
+# TCP and UDP ports share one line: TCP at 0-65535, UDP at 65536-131071
+MAX_PORT = 65535
+PROTOCOL_OFFSETS = {"tcp": (0,), "udp": (MAX_PORT + 1,), None: (0, MAX_PORT + 1)}
+
+# Tokens meaning "every service"
+ANY_SERVICES = frozenset(["any", "all"])
+
+# ---------------- Built-in service names ----------------
+# Consulted after service_port_map, so the config can still rename or override
+SERVICE_PORTS = {
+    "ftp": ("tcp/20-21",),
+    "ftp_basic": ("tcp/21",),
+    "ssh": ("tcp/22",),
+    "telnet": ("tcp/23",),
+    "smtp": ("tcp/25",),
+    "dns": ("53",),
+    "domain": ("53",),
+    "bootp": ("udp/67-68",),
+    "dhcp": ("udp/67-68",),
+    "dhcp-request": ("udp/67",),
+    "dhcp-reply": ("udp/68",),
+    "tftp": ("udp/69",),
+    "http": ("tcp/80",),
+    "kerberos": ("88",),
+    "pop3": ("tcp/110",),
+    "ntp": ("udp/123",),
+    "epmap": ("135",),
+    "netbios": ("137-139",),
+    "imap": ("tcp/143",),
+    "snmp": ("udp/161",),
+    "snmp-traps": ("udp/162",),
+    "bgp": ("tcp/179",),
+    "ldap": ("389",),
+    "https": ("tcp/443",),
+    "smb": ("tcp/445",),
+    "microsoft-ds": ("tcp/445",),
+    "smtps": ("tcp/465",),
+    "syslog": ("udp/514",),
+    "lpd": ("tcp/515",),
+    "submission": ("tcp/587",),
+    "ldap-ssl": ("tcp/636",),
+    "ldaps": ("tcp/636",),
+    "mssql": ("tcp/1433",),
+    "ms-sql-server": ("tcp/1433",),
+    "ica": ("tcp/1494",),
+    "citrix": ("tcp/1494", "tcp/2598"),
+    "oracle": ("tcp/1521",),
+    "mysql": ("tcp/3306",),
+    "rdp": ("tcp/3389",),
+    "remote_desktop_protocol": ("tcp/3389",),
+    "ms_terminal_services": ("tcp/3389",),
+    "postgres": ("tcp/5432",),
+    "vnc": ("tcp/5900",),
+    "winrm-http": ("tcp/5985",),
+    "winrm-https": ("tcp/5986",),
+    "irc": ("tcp/6667",),
+}
+
+# tcp_8000-8080, udp_53, tcp-49152_65535, vpn_tcp-10000
+PROTOCOL_FIRST = re.compile(r"(?:[a-z0-9]+[_-])?(tcp|udp)[_/-]?(\d+)(?:[_-](\d+))?")
+# pix_8490-tcp
+PORT_FIRST = re.compile(r"(?:[a-z0-9]+_)?(\d+)[_/-](tcp|udp)")
+# 8080, 1024-65535, tcp/443
+PORT_SPEC = re.compile(r"(?:(tcp|udp)/)?(\d+)(?:-(\d+))?")
+# http_8080: a known service on a non-standard port
+NAMED_PORT = re.compile(r"([a-z][a-z0-9-]*)_(\d+)")
+
+
+class PortSet(RangeSet):
+    """RangeSet over the shared TCP/UDP port line."""
+
+    __slots__ = ()
+
+    def __str__(self):
+        """'tcp/8000-8080, 53': ranges open on both protocols lose their prefix."""
+        per_protocol = {}
+        for protocol in ("tcp", "udp"):
+            offset = PROTOCOL_OFFSETS[protocol][0]
+            window = self & PortSet([(offset, offset + MAX_PORT)])
+            per_protocol[protocol] = [(lo - offset, hi - offset) for lo, hi in window.ranges()]
+
+        both = set(per_protocol["tcp"]) & set(per_protocol["udp"])
+        labelled = [(r, None) for r in both] + [
+            (r, protocol) for protocol, ranges in per_protocol.items() for r in ranges if r not in both
+        ]
+        parts = []
+        for (lo, hi), protocol in sorted(labelled):
+            ports = str(lo) if lo == hi else f"{lo}-{hi}"
+            parts.append(ports if protocol is None else f"{protocol}/{ports}")
+        return ", ".join(parts)
+
+
+EMPTY = PortSet()
+ALL_PORTS = PortSet((offset, offset + MAX_PORT) for offset in PROTOCOL_OFFSETS[None])
+
+
+def port_range(protocol, first, last=None):
+    """[(lo, hi), ...] on the shared line, or [] for ports outside 0-65535."""
+    first, last = int(first), int(first if last is None else last)
+    if not 0 <= first <= last <= MAX_PORT:
+        return []
+    return [(offset + first, offset + last) for offset in PROTOCOL_OFFSETS[protocol]]
+
+
+def parse_spec(spec):
+    """'tcp/8000-8080', 'udp/53', '137-139' (both protocols) -> [(lo, hi), ...]."""
+    match = PORT_SPEC.fullmatch(spec)
+    return port_range(*match.groups()) if match else []
+
+
+def parse_service(text):
+    """
+    PortSet of one service token: a built-in service name, a port or range
+    ('8080', '1024-65535', 'tcp/443'), or a vendor object such as tcp_8000-8080.
+    Unknown names and port-less services (icmp) give an empty set.
+    """
+    text = text.strip().strip("[]'\"").lower()
+    if text in ANY_SERVICES:
+        return ALL_PORTS
+    if text in SERVICE_PORTS:
+        return PortSet(r for spec in SERVICE_PORTS[text] for r in parse_spec(spec))
+
+    match = PORT_SPEC.fullmatch(text)
+    if match:
+        return PortSet(port_range(*match.groups()))
+    match = PROTOCOL_FIRST.fullmatch(text)
+    if match:
+        return PortSet(port_range(*match.groups()))
+    match = PORT_FIRST.fullmatch(text)
+    if match:
+        port, protocol = match.groups()
+        return PortSet(port_range(protocol, port))
+    match = NAMED_PORT.fullmatch(text)
+    if match and match.group(1) in SERVICE_PORTS:
+        name, port = match.groups()
+        protocols = {spec.split("/")[0] if "/" in spec else None for spec in SERVICE_PORTS[name]}
+        return PortSet(r for protocol in protocols for r in port_range(protocol, port))
+    return EMPTY
@@ -0,0 +1,83 @@
+# This file is part of FireFind Project.
+#
+# Copyright (C) 2025 Your Name
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from bisect import bisect_left, bisect_right
+
+
+class RangeSet:
+    """
+    Sorted, merged integer ranges (ports, addresses). Overlap and cover tests
+    bisect the larger set once per range of the smaller one: O(m log n).
+    """
+
+    __slots__ = ("starts", "ends")
+
+    def __init__(self, ranges=()):
+        merged = []
+        for lo, hi in sorted(ranges):
+            if merged and lo <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], hi)
+            else:
+                merged.append([lo, hi])
+        self.starts = tuple(lo for lo, _ in merged)
+        self.ends = tuple(hi for _, hi in merged)
+
+    def ranges(self):
+        return zip(self.starts, self.ends)
+
+    def __bool__(self):
+        return bool(self.starts)
+
+    def __eq__(self, other):
+        return isinstance(other, RangeSet) and self.starts == other.starts and self.ends == other.ends
+
+    def __hash__(self):
+        return hash((self.starts, self.ends))
+
+    def __or__(self, other):
+        return type(self)(list(self.ranges()) + list(other.ranges()))
+
+    def __and__(self, other):
+        ranges, i, j = [], 0, 0
+        while i < len(self.starts) and j < len(other.starts):
+            lo, hi = max(self.starts[i], other.starts[j]), min(self.ends[i], other.ends[j])
+            if lo <= hi:
+                ranges.append((lo, hi))
+            if self.ends[i] < other.ends[j]:
+                i += 1
+            else:
+                j += 1
+        return type(self)(ranges)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({list(self.ranges())!r})"
+
+    def overlaps_range(self, lo, hi):
+        k = bisect_left(self.ends, lo)
+        return k < len(self.starts) and self.starts[k] <= hi
+
+    def covers_range(self, lo, hi):
+        k = bisect_right(self.starts, lo) - 1
+        return k >= 0 and self.ends[k] >= hi
+
+    def overlaps(self, other):
+        small, large = (self, other) if len(self.starts) <= len(other.starts) else (other, self)
+        return any(large.overlaps_range(lo, hi) for lo, hi in small.ranges())
+
+    def covers(self, other):
+        """True when every range of other lies inside this set."""
+        return all(self.covers_range(lo, hi) for lo, hi in other.ranges())
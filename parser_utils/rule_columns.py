@@ -0,0 +1,197 @@
+# This file is part of FireFind Project.
+#
+# Copyright (C) 2025 Your Name
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Rules as flat binary columns, for handing them to worker processes through shared
+memory and for the parse cache. Each slot is dictionary encoded: its distinct values
+once (token tuples as uint32 code arrays with offsets, anything else as a kind byte
+plus UTF-8 text with offsets) and a uint32 index per rule. The layout is a plain
+JSON-able dict that names each slot's buffers, so rules are rebuilt by slot name
+rather than by position.
+"""
+
+import itertools
+from array import array
+from collections import deque
+from operator import attrgetter
+
+from parser_utils.rule_model import Rule, coerce
+from parser_utils.symbols import SYMBOLS, SymbolTable
+
+# Value kinds, one byte per distinct value
+NONE, TEXT, FALSE, TRUE, INT, FLOAT = range(6)
+
+# Every buffer starts on this boundary so it can be cast in place
+ALIGN = 8
+
+
+# Kinds by exact type; bools and str subclasses (enum members) go through value_kind()
+TYPE_KINDS = {type(None): NONE, str: TEXT, int: INT, float: FLOAT}
+
+
+def value_kind(value):
+    kind = TYPE_KINDS.get(type(value))
+    if kind is not None:
+        return kind
+    if value is True:
+        return TRUE
+    if value is False:
+        return FALSE
+    if isinstance(value, str):
+        return TEXT
+    if isinstance(value, int):
+        return INT
+    if isinstance(value, float):
+        return FLOAT
+    raise TypeError(f"can't pack {type(value).__name__} rule values")
+
+
+class Packer:
+    """Buffers laid out back to back; add() returns the [offset, nbytes] to put in the layout."""
+
+    def __init__(self):
+        self.parts = []
+        self.size = 0
+
+    def add(self, buffer):
+        data = memoryview(buffer).cast("B")
+        at, pad = self.size, -len(data) % ALIGN
+        self.parts.append(data)
+        if pad:
+            self.parts.append(bytes(pad))
+        self.size += len(data) + pad
+        return [at, len(data)]
+
+
+def view(buf, at, fmt="B"):
+    offset, nbytes = at
+    if offset < 0 or nbytes < 0 or offset + nbytes > len(buf):
+        raise ValueError("column buffer out of range")
+    return buf[offset:offset + nbytes].cast(fmt)
+
+
+def distinct(keys):
+    """(distinct keys in first-seen order, uint32 index of each key)."""
+    keys = list(keys)
+    codes = dict(zip(dict.fromkeys(keys), itertools.count()))
+    return list(codes), array("I", map(codes.__getitem__, keys))
+
+
+def pack_values(packer, values):
+    kinds = bytes(map(value_kind, values))
+    if kinds.count(TEXT) == len(kinds):
+        texts = values
+    else:
+        texts = ["" if kind in (NONE, FALSE, TRUE) else str(value) for kind, value in zip(kinds, values)]
+    return {"kinds": packer.add(kinds),
+            "text": packer.add("".join(texts).encode("utf-8")),
+            "offsets": packer.add(array("Q", itertools.accumulate(map(len, texts), initial=0)))}
+
+
+def unpack_values(buf, entry, enum_cls=None):
+    kinds = bytes(view(buf, entry["kinds"]))
+    text = str(view(buf, entry["text"]), "utf-8")
+    offsets = view(buf, entry["offsets"], "Q").tolist()
+    if len(offsets) != len(kinds) + 1 or offsets[-1] != len(text):
+        raise ValueError("column offsets don't match the values")
+
+    values = [text[start:end] for start, end in zip(offsets, offsets[1:])]
+    for i, kind in enumerate(kinds):
+        if kind == TEXT:
+            if enum_cls is not None:
+                values[i] = coerce(enum_cls, values[i])
+        elif kind == NONE:
+            values[i] = None
+        elif kind in (FALSE, TRUE):
+            values[i] = kind == TRUE
+        elif kind == INT:
+            values[i] = int(values[i])
+        elif kind == FLOAT:
+            values[i] = float(values[i])
+        else:
+            raise ValueError(f"unknown value kind {kind}")
+    return values
+
+
+def pack_tokens(packer, values, recode=None):
+    codes = itertools.chain.from_iterable(values)
+    return {"codes": packer.add(array("I", codes if recode is None else map(recode, codes))),
+            "offsets": packer.add(array("Q", itertools.accumulate(map(len, values), initial=0)))}
+
+
+def unpack_tokens(buf, entry, translate=None):
+    codes = view(buf, entry["codes"], "I").tolist()
+    offsets = view(buf, entry["offsets"], "Q").tolist()
+    if offsets[-1] != len(codes):
+        raise ValueError("token offsets don't match the codes")
+    if translate is not None:
+        codes = [translate[c] for c in codes]
+    return [tuple(codes[start:end]) for start, end in zip(offsets, offsets[1:])]
+
+
+def pack_rules(rules, own_symbols=False):
+    """
+    (layout, parts) for a list of rules; the parts are written back to back and take
+    layout["size"] bytes. Token codes are this process's SYMBOLS codes (for workers
+    that load the same table), or with own_symbols renumbered into a table stored
+    alongside, for readers in another process.
+    """
+    packer = Packer()
+    layout = {"rules": len(rules), "slots": {}}
+    local = SymbolTable() if own_symbols else None
+    recode = (lambda code: local.code(SYMBOLS.text(code))) if own_symbols else None
+
+    for slot in Rule.__slots__:
+        column = list(map(attrgetter(slot), rules))
+        if slot in Rule.TOKEN_FIELDS:
+            values, index = distinct(column)
+            entry = {"tokens": pack_tokens(packer, values, recode)}
+        else:
+            if len(set(map(type, column)) & {bool, int, float}) > 1:
+                # True == 1 == 1.0: keyed by type too, so they stay apart
+                keys, index = distinct(zip(map(type, column), column))
+                values = [value for _, value in keys]
+            else:
+                values, index = distinct(column)
+            entry = {"values": pack_values(packer, values)}
+        entry["index"] = packer.add(index)
+        layout["slots"][slot] = entry
+    if own_symbols:
+        layout["symbols"] = pack_values(packer, local.snapshot())
+    layout["size"] = packer.size
+    return layout, packer.parts
+
+
+def unpack_rules(buf, layout):
+    """Rules back from a buffer holding pack_rules() parts; ValueError if it doesn't fit the layout."""
+    buf = memoryview(buf).cast("B")
+    translate = SYMBOLS.encode(unpack_values(buf, layout["symbols"])) if "symbols" in layout else None
+    rules = [Rule() for _ in range(layout["rules"])]
+
+    for slot, entry in layout["slots"].items():
+        if slot not in Rule.__slots__:
+            raise ValueError(f"unknown rule slot {slot!r}")
+        if "tokens" in entry:
+            values = unpack_tokens(buf, entry["tokens"], translate)
+        else:
+            values = unpack_values(buf, entry["values"], Rule.ENUM_FIELDS.get(slot))
+        index = view(buf, entry["index"], "I").tolist()
+        if len(index) != len(rules):
+            raise ValueError(f"column {slot!r} holds {len(index)} of {len(rules)} rules")
+        # Set the slot on every rule through its descriptor, without a Python-level loop
+        deque(map(getattr(Rule, slot).__set__, rules, map(values.__getitem__, index)), maxlen=0)
+    return rules
@@ -0,0 +1,220 @@
+# This file is part of FireFind Project.
+#
+# Copyright (C) 2025 Your Name
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import re
+import sys
+from enum import StrEnum
+from functools import lru_cache
+
+from parser_utils.addresses import code_intervals
+from parser_utils.symbols import SYMBOLS
+
+TOKEN_SPLIT = re.compile(r"[\s,;]+")
+
+
+class Action(StrEnum):
+    ACCEPT = "accept"
+    ALLOW = "allow"
+    DENY = "deny"
+    DROP = "drop"
+    REJECT = "reject"
+
+
+class Log(StrEnum):
+    ALL = "all"
+    LOG = "log"
+    ENABLED = "enabled"
+    DISABLE = "disable"
+    NONE = "none"
+    NO_LOG = "no log"
+    ALL_SESSIONS = "log all sessions"
+    SECURITY_EVENTS = "log security events"
+    VIOLATION_TRAFFIC = "log violation traffic"
+
+
+class Status(StrEnum):
+    ENABLE = "enable"
+    DISABLE = "disable"
+    ENABLED = "enabled"
+
+
+def coerce(enum_cls, value):
+    """Map a value onto enum_cls, keeping unknown vendor values as interned strings."""
+    try:
+        return enum_cls(value)
+    except ValueError:
+        return sys.intern(str(value))
+
+
+@lru_cache(maxsize=8192)
+def tokenize(value):
+    """Split a lowercased field value into address/service token codes (see SYMBOLS)."""
+    return SYMBOLS.encode(t for t in TOKEN_SPLIT.split(value.strip().lower()) if t)
+
+
+def negate_flag(value):
+    """'enable' -> True, 'disable' -> False, anything else (absent/blank) -> None."""
+    value = str(value).strip().lower()
+    if value == "enable":
+        return True
+    if value == "disable":
+        return False
+    return None
+
+
+def negate_text(flag, default=""):
+    if flag is None:
+        return default
+    return "enable" if flag else "disable"
+
+
+class Rule:
+    """
+    One normalized firewall rule. srcaddr/dstaddr/service hold tuples of SYMBOLS codes
+    of the lowercased tokens for the checker; the *_text slots keep the display value
+    used in findings. get()/to_dict() give the same view as the parser's original rule
+    dicts. Pickled state carries token text, so rules survive process boundaries.
+    """
+
+    __slots__ = (
+        "id", "name", "srcaddr", "dstaddr", "service",
+        "srcaddr_text", "dstaddr_text", "service_text",
+        "dst_port", "action", "log", "comment", "risk_rating", "status",
+        "srcaddr_negate", "dstaddr_negate", "service_negate", "vendor",
+    )
+
+    TOKEN_FIELDS = ("srcaddr", "dstaddr", "service")
+    NEGATE_FIELDS = ("srcaddr_negate", "dstaddr_negate", "service_negate")
+    # Slots holding enum members (or unknown vendor values as plain strings, see coerce())
+    ENUM_FIELDS = {"action": Action, "log": Log, "status": Status}
+
+    def __init__(self, id="", name="", srcaddr=(), dstaddr=(), service=(),
+                 srcaddr_text="", dstaddr_text="", service_text="",
+                 dst_port="", action="", log="", comment="", risk_rating=None, status="",
+                 srcaddr_negate=None, dstaddr_negate=None, service_negate=None, vendor=None):
+        self.id = id
+        self.name = name
+        self.srcaddr = srcaddr
+        self.dstaddr = dstaddr
+        self.service = service
+        self.srcaddr_text = srcaddr_text
+        self.dstaddr_text = dstaddr_text
+        self.service_text = service_text
+        self.dst_port = dst_port
+        self.action = action
+        self.log = log
+        self.comment = comment
+        self.risk_rating = risk_rating
+        self.status = status
+        self.srcaddr_negate = srcaddr_negate
+        self.dstaddr_negate = dstaddr_negate
+        self.service_negate = service_negate
+        self.vendor = vendor
+
+    @classmethod
+    def from_dict(cls, rule):
+        """Build a Rule from a parser rule dict."""
+        srcaddr = str(rule.get("srcaddr", ""))
+        dstaddr = str(rule.get("dstaddr", ""))
+        service = str(rule.get("service", ""))
+        return cls(
+            id=rule.get("id", ""),
+            name=rule.get("name", ""),
+            srcaddr=tokenize(srcaddr),
+            dstaddr=tokenize(dstaddr),
+            service=tokenize(service),
+            srcaddr_text=sys.intern(srcaddr),
+            dstaddr_text=sys.intern(dstaddr),
+            service_text=sys.intern(service),
+            dst_port=rule.get("dst_port", ""),
+            action=coerce(Action, rule.get("action", "")),
+            log=coerce(Log, rule.get("log", "")),
+            comment=rule.get("comment", ""),
+            risk_rating=rule.get("risk_rating"),
+            status=coerce(Status, rule.get("status", "")),
+            srcaddr_negate=negate_flag(rule.get("srcaddr_negate", "")),
+            dstaddr_negate=negate_flag(rule.get("dstaddr_negate", "")),
+            service_negate=negate_flag(rule.get("service_negate", "")),
+            vendor=rule.get("vendor"),
+        )
+
+    def get(self, field, default=""):
+        """Dict-style access returning the parser's original string values."""
+        if field in self.TOKEN_FIELDS:
+            return getattr(self, f"{field}_text")
+        if field in self.NEGATE_FIELDS:
+            return negate_text(getattr(self, field), default)
+        if field in self.__slots__:
+            value = getattr(self, field)
+            return default if value is None else value
+        return default
+
+    def tokens(self, field):
+        """Token codes of a field; pre-split for srcaddr/dstaddr/service."""
+        if field in self.TOKEN_FIELDS:
+            return getattr(self, field)
+        return tokenize(str(self.get(field, "")))
+
+    def token_text(self, field):
+        """Lowercased token strings of a field."""
+        return SYMBOLS.decode(self.tokens(field))
+
+    def intervals(self, field):
+        """Integer address intervals of a field's tokens (see parser_utils.addresses)."""
+        return tuple(interval for code in self.tokens(field) for interval in code_intervals(code))
+
+    def to_dict(self):
+        rule = {
+            "id": self.id,
+            "name": self.name,
+            "srcaddr": self.srcaddr_text,
+            "dstaddr": self.dstaddr_text,
+            "service": self.service_text,
+            "dst_port": self.dst_port,
+            "action": str(self.action),
+            "log": str(self.log),
+            "comment": self.comment,
+            "status": str(self.status),
+            "vendor": self.vendor,
+        }
+        if self.risk_rating is not None:
+            rule["risk_rating"] = self.risk_rating
+        for field in self.NEGATE_FIELDS:
+            if getattr(self, field) is not None:
+                rule[field] = negate_text(getattr(self, field))
+        return rule
+
+    def __getstate__(self):
+        return tuple(SYMBOLS.decode(getattr(self, slot)) if slot in self.TOKEN_FIELDS else getattr(self, slot)
+                     for slot in self.__slots__)
+
+    def __setstate__(self, state):
+        for slot, value in zip(self.__slots__, state):
+            setattr(self, slot, SYMBOLS.encode(value) if slot in self.TOKEN_FIELDS else value)
+
+    @classmethod
+    def from_state(cls, state):
+        """Rebuild a Rule from __getstate__() values (token text, not codes)."""
+        rule = cls.__new__(cls)
+        rule.__setstate__(state)
+        return rule
+
+    def __eq__(self, other):
+        return isinstance(other, Rule) and self.__getstate__() == other.__getstate__()
+
+    def __repr__(self):
+        return f"Rule(id={self.id!r}, name={self.name!r}, vendor={self.vendor!r})"
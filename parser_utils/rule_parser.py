@@ -15,14 +15,26 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-import csv
-import pandas as pd
+import itertools
 import re
 import os
-import json
-from config.config_loader import load_config
+from config.config_loader import get_config
+from parser_utils import header_sniffer
+from parser_utils.checkpoint_reader import iter_checkpoint_rows
+from parser_utils.rule_model import Rule
+from parser_utils.section_index import iter_section_rows
+from parser_utils.sophos_reader import iter_sophos_rules
+from parser_utils.xlsx_reader import find_policy_sheets, open_policy_sheet
 
-config = load_config()
+# Logical fields projected from the generic CSV/XLSX layouts
+RULE_FIELDS = ["id", "name", "srcaddr", "dstaddr", "service", "action",
+               "log", "comment", "risk_rating", "status"]
+
+# Fraction of a vendor's detect_headers_any that must appear in one header row
+SNIFF_MIN_CONFIDENCE = 0.8
+
+# First port or port range of a service string (dst_port)
+PORT_PATTERN = r"(\d+(?:[-_]\d+)?)"
 
 
 def detect_vendor(file_path):
@@ -43,17 +55,33 @@ def detect_vendor(file_path):
     if "sophos" in file_name:
         return "sophos"
 
+    return sniff_vendor(file_path)
+
+
+def sniff_vendor(file_path, min_confidence=SNIFF_MIN_CONFIDENCE):
+    """Detect vendor from the first rows of the file when the filename gives no hint."""
+    config = get_config()
+    vendor_headers = {v: config.vendor_detection_headers(v) for v in config.vendor_keys()}
+    try:
+        vendor, confidence = header_sniffer.sniff_vendor(file_path, vendor_headers)
+    except Exception as e:
+        print(f"⚠️ Could not read headers for vendor detection: {e}")
+        return None
+
+    if vendor and confidence >= min_confidence:
+        print(f"🔍 Vendor detected from headers: {vendor} ({confidence:.0%} confidence)")
+        return vendor
     return None
 
 
-def get_col_value(row, df, field, mappings, vendor=None):
+def get_col_value(row, columns, field, mappings, vendor=None):
     """Fetch logical field values, apply normalization, return lowercase."""
     for alias in mappings.get(field, []):
         alias = alias.lower().strip()
-        if alias in df.columns:
+        if alias in columns:
             val = str(row.get(alias, "")).strip()
             if val and val.lower() not in ["nan", "none"]:
-                vendor_norms = config.data["vendor_mappings"].get(vendor, {}).get("normalization", {})
+                vendor_norms = get_config().normalization(vendor)
                 if field in vendor_norms:
                     normalized = vendor_norms[field].get(val.lower())
                     if normalized:
@@ -62,12 +90,109 @@ def get_col_value(row, df, field, mappings, vendor=None):
     return ""
 
 
+def build_column_plan(columns, mappings):
+    """Resolve each logical field to the aliases present in this file, once per file."""
+    plan = {}
+    for field, aliases in mappings.items():
+        present = []
+        for alias in aliases:
+            alias = alias.lower().strip()
+            if alias in columns and alias not in present:
+                present.append(alias)
+        plan[field] = present
+    return plan
+
+
+def project_columns(df, plan, vendor=None):
+    """Vectorized get_col_value: coalesce aliases, normalize and lowercase whole columns."""
+    import pandas as pd
+
+    vendor_norms = get_config().normalization(vendor)
+    projected = pd.DataFrame(index=df.index)
+
+    for field in RULE_FIELDS:
+        result = pd.Series("", index=df.index, dtype=object)
+        unresolved = pd.Series(True, index=df.index)
+
+        for alias in plan.get(field, []):
+            values = df[alias].astype(str).str.strip()
+            valid = (values != "") & ~values.str.lower().isin(["nan", "none"])
+            take = unresolved & valid
+            result[take] = values[take]
+            unresolved &= ~valid
+
+        lowered = result.str.lower()
+        if field in vendor_norms:
+            normalized = lowered.map(vendor_norms[field]).fillna("").astype(str).str.lower()
+            lowered = normalized.where(normalized != "", lowered)
+        projected[field] = lowered
+
+    return projected
+
+
+def group_rules(projected, vendor):
+    """
+    Collapse multi-row rules with a vectorized groupby. Only consecutive rows sharing an
+    id are merged: exports repeat seq # across blocks, and those are separate rules.
+    """
+    projected = projected[projected["id"] != ""]
+    if projected.empty:
+        return []
+
+    key = (projected["id"] != projected["id"].shift()).cumsum()
+    projected = projected.assign(group=key.values)
+
+    grouped = projected.groupby("group", sort=False)
+    merged = grouped[["id", "name", "action", "log", "comment", "risk_rating", "status"]].first()
+
+    for field in ["srcaddr", "dstaddr", "service"]:
+        values = projected.loc[projected[field] != "", ["group", field]].drop_duplicates()
+        values = values.sort_values(field, kind="stable")
+        merged[field] = values.groupby("group", sort=False)[field].agg(", ".join)
+    merged = merged.fillna("")
+
+    merged["dst_port"] = merged["service"].str.extract(PORT_PATTERN, expand=False).fillna("").str.replace("_", "-")
+    merged["status"] = merged["status"].where(merged["status"] != "", "enable")
+    merged["vendor"] = vendor
+
+    columns = ["id", "name", "srcaddr", "dstaddr", "service", "dst_port", "action",
+               "log", "comment", "risk_rating", "status", "vendor"]
+    return merged[columns].to_dict("records")
+
+
+def stream_group_rules(frames, vendor):
+    """Group consecutive rows per id across frames, flushing a rule once its id changes."""
+    import pandas as pd
+
+    carry = None
+    for projected in frames:
+        projected = projected[projected["id"] != ""]
+        if carry is not None:
+            projected = pd.concat([carry, projected], ignore_index=True)
+        if projected.empty:
+            continue
+
+        # The last id run may continue in the next frame, so hold it back
+        runs = (projected["id"] != projected["id"].shift()).cumsum()
+        last = runs == runs.iloc[-1]
+        carry = projected[last]
+        yield from group_rules(projected[~last], vendor)
+
+    if carry is not None:
+        yield from group_rules(carry, vendor)
+
+
 def extract_port(service_str):
-    """Extract first numeric port from a service string (e.g., 'TCP_3389' -> '3389')."""
+    """Extract the first port or range from a service string (e.g., 'TCP_3389' -> '3389', 'tcp_8000-8080' -> '8000-8080')."""
     if not service_str:
         return ""
-    match = re.search(r"(\d+)", service_str)
-    return match.group(1) if match else ""
+    match = re.search(PORT_PATTERN, service_str)
+    return match.group(1).replace("_", "-") if match else ""
+
+
+def join_values(value):
+    """Join a JSON list value into a comma separated string."""
+    return ", ".join(value) if isinstance(value, list) else str(value)
 
 
 def safe_extract(pattern, text):
@@ -76,284 +201,259 @@ def safe_extract(pattern, text):
     return m.group(1) if m else ""
 
 
-def parse_file(file_path, vendor=None):
-    """Parse CSV/XLSX into normalized firewall rules using vendor mappings."""
+def find_id_field(columns, mappings):
+    """Return the first id alias present in the file's columns."""
+    for alias in mappings.get("id", []):
+        if alias.lower() in columns:
+            return alias.lower()
+    return None
+
+
+def iter_batches(rows, size=None):
+    """Split an iterator into lists of at most size items (one list if size is None)."""
+    if size is None:
+        yield list(rows)
+        return
+    while True:
+        batch = list(itertools.islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+# ---------------- Sophos CSV ----------------
+def iter_sophos(file_path):
+    # Normalize log_traffic boolean -> enabled/disable, lookup resolved once per file
+    log_norms = get_config().normalization("sophos").get("log", {})
+
+    for counter, rule_json in enumerate(iter_sophos_rules(file_path), start=1):
+        log_val = str(rule_json.get("log_traffic", "enabled")).lower()
+        log_val = log_norms.get(log_val, log_val)
+        service_str = join_values(rule_json.get("services", ""))
+
+        yield {
+            "id": rule_json.get("id", counter),
+            "name": rule_json.get("name", "").lower(),
+            "srcaddr": join_values(rule_json.get("source", "")),
+            "dstaddr": join_values(rule_json.get("destination", "")),
+            "service": service_str,
+            "dst_port": extract_port(service_str),
+            "action": rule_json.get("action", "").lower(),
+            "log": log_val,  # ✅ normalized log value
+            "comment": rule_json.get("comment", "").lower(),
+            "status": rule_json.get("status", "enable").lower(),
+            "vendor": "sophos"
+        }
+
+
+# ---------------- Client3 CSV ----------------
+def iter_client3_csv(file_path, vendor, mappings, section="IPv4 Local In Policy"):
+    # Seek straight to the wanted section through the cached section offset index
+    reader = iter_section_rows(file_path, section)
+    if reader is None:
+        print(f"❌ No {section} section found.")
+        return
+
+    headers = [h.strip().lower() for h in next(reader, [])]
+    if "policyid" not in headers:
+        print(f"❌ No policyid column in {section} section")
+        return
+
+    for line in reader:
+        row = dict(itertools.zip_longest(headers, line[:len(headers)], fillvalue=""))
+        rid = row.get("policyid", "").strip()
+        if not rid.isdigit():
+            continue
+        service_val = row.get("service", "").strip()
+
+        yield {
+            "id": rid,
+            "name": row.get("comments", "").lower(),
+            "srcaddr": row.get("srcaddr", "").lower(),
+            "dstaddr": row.get("dstaddr", "").lower(),
+            "service": service_val.lower(),
+            "dst_port": extract_port(service_val),
+            "action": row.get("action", "").lower(),
+            "log": row.get("log", "log all sessions").lower(),
+            "srcaddr_negate": row.get("srcaddr-negate", "").lower(),
+            "dstaddr_negate": row.get("dstaddr-negate", "").lower(),
+            "service_negate": row.get("service-negate", "").lower(),
+            "comment": row.get("comments", "").lower(),
+            "status": get_col_value(row, headers, "status", mappings, vendor) or "enable",
+            "vendor": vendor
+        }
+
+
+# ---------------- Check Point CSV ----------------
+def iter_checkpoint(file_path, vendor):
+    # Enabled flag -> enable/disable, merged once from the vendor's normalization block
+    status_map = {"true": "enable", "yes": "enable", "1": "enable"}
+    status_map.update(get_config().normalization(vendor).get("status", {}))
+
+    for parts in iter_checkpoint_rows(file_path):
+        if not parts or not parts[0].strip():
+            continue
+
+        parts += [""] * (10 - len(parts))
+        num, name, source, destination, service, action, track, install_on, enabled, comments = parts[:10]
+
+        yield {
+            "id": num,
+            "name": name.lower(),
+            "srcaddr": source.lower(),
+            "dstaddr": destination.lower(),
+            "service": service.lower(),
+            "dst_port": extract_port(service),
+            "action": action.lower(),
+            "log": track.lower(),
+            "comment": comments.lower(),
+            "status": status_map.get(enabled.lower(), "disable"),
+            "vendor": vendor
+        }
+
+
+# ---------------- Generic CSV (Client1, Fortinet, etc.) ----------------
+def iter_csv_frames(file_path, vendor, mappings, chunksize=None):
+    """Yield projected frames of a generic CSV; rows without a numeric id are dropped."""
+    import pandas as pd
+
+    reader = pd.read_csv(file_path, dtype=str, delimiter=",", quotechar='"', engine="python", chunksize=chunksize)
+    chunks = [reader] if chunksize is None else reader
+
+    id_field = plan = None
+    for df in chunks:
+        df = df.fillna("")
+        df.columns = [str(c).strip().lower() for c in df.columns]
+
+        if plan is None:
+            id_field = find_id_field(df.columns, mappings)
+            if not id_field:
+                return
+            plan = build_column_plan(df.columns, mappings)
+
+        df = df[df[id_field].astype(str).str.strip().str.isdigit()]
+        yield project_columns(df, plan, vendor)
+
+
+# ---------------- XLSX (Client1, Client2, etc.) ----------------
+def xlsx_header_markers(vendor, mappings):
+    """
+    Header cells identifying a policy sheet, and how many rows to search for them.
+    Client2 exports have the header on the first row; others are located by "seq #"/"action".
+    """
+    if vendor == "client2":
+        return [mappings.get("id", ["id"])[0].lower(), "action"], 1
+    return ["seq #", "action"], 50
+
+
+def find_xlsx_policy_sheets(file_path, vendor=None):
+    """Return [(sheet index, sheet name)] of every sheet with a recognizable policy header."""
+    vendor = vendor or detect_vendor(file_path)
+    mappings = get_config().columns(vendor)
+    markers, max_rows = xlsx_header_markers(vendor, mappings)
+    return find_policy_sheets(file_path, markers, max_rows)
+
+
+def iter_xlsx_frames(file_path, vendor, mappings, chunksize=None, sheet_index=0):
+    """Yield projected frames streamed from one sheet of an XLSX export."""
+    import pandas as pd
+
+    markers, _ = xlsx_header_markers(vendor, mappings)
+    sheet = open_policy_sheet(file_path, None if vendor == "client2" else markers, sheet_index)
+    if sheet is None:
+        return
+
+    id_field = find_id_field(sheet.columns, mappings)
+    if not id_field:
+        sheet.close()
+        return
+
+    # Stream only the mapped columns; repeated header rows are skipped by the reader
+    plan = build_column_plan(sheet.columns, mappings)
+    usecols = [id_field]
+    for aliases in plan.values():
+        usecols += [alias for alias in aliases if alias not in usecols]
+
+    for batch in iter_batches(sheet.rows(usecols), chunksize):
+        df = pd.DataFrame.from_records(batch, columns=usecols)
+        df = df[df[id_field].str.strip() != ""]
+        projected = project_columns(df, plan, vendor)
+        yield projected[projected["id"].str.isdigit()]
+
+
+def open_rule_source(file_path, vendor, mappings, chunksize=None, sheet_index=0):
+    """
+    Pick the reader for a vendor/format. Returns ("rules", iterator of rule dicts)
+    for one-row-per-rule formats, ("frames", iterator of projected frames) for
+    formats that spread a rule over several rows, or (None, None).
+    """
+    if vendor == "sophos" and file_path.endswith(".csv"):
+        return "rules", iter_sophos(file_path)
+    if file_path.endswith(".csv") and vendor == "client3_csv":
+        return "rules", iter_client3_csv(file_path, vendor, mappings)
+    if file_path.endswith(".csv") and vendor == "checkpoint":
+        return "rules", iter_checkpoint(file_path, vendor)
+    if file_path.endswith(".csv"):
+        return "frames", iter_csv_frames(file_path, vendor, mappings, chunksize)
+    if file_path.endswith(".xlsx"):
+        return "frames", iter_xlsx_frames(file_path, vendor, mappings, chunksize, sheet_index)
+    return None, None
+
+
+def resolve_vendor(file_path, vendor=None):
+    """Detect the vendor and return (vendor, column mappings), or (None, None)."""
     if not vendor:
         vendor = detect_vendor(file_path)
     if not vendor:
         print("❌ Could not detect vendor.")
-        return []
+        return None, None
 
     print(f"✅ Vendor Detected: {vendor}")
 
-    mappings = config.data["vendor_mappings"].get(vendor, {}).get("columns", {})
+    mappings = get_config().columns(vendor)
     if not mappings and vendor not in ["sophos", "checkpoint", "client3_csv"]:
         print(f"❌ No vendor mapping found for: {vendor}")
-        return []
+        return None, None
 
-    rules = []
+    return vendor, mappings
 
-    try:
-        # ---------------- Sophos CSV ----------------
-        if vendor == "sophos" and file_path.endswith(".csv"):
-            df = pd.read_csv(file_path, usecols=[0], header=None, engine="python")
-            df = df.iloc[2:]  # skip first 2 rows
-            counter = 1
-
-            for _, row in df.iterrows():
-                cell = str(row[0]).strip()
-                if not cell or not cell.startswith("{"):
-                    continue
-                try:
-                    if "}" in cell:
-                        cell = cell[:cell.rfind("}")+1]
-                        
-                    rule_json = json.loads(cell)
-
-                    # Normalize log_traffic boolean -> enabled/disable
-                    log_val = str(rule_json.get("log_traffic", "enabled")).lower()
-                    vendor_norms = config.data["vendor_mappings"].get("sophos", {}).get("normalization", {})
-                    if "log" in vendor_norms and log_val in vendor_norms["log"]:
-                        log_val = vendor_norms["log"][log_val]
-
-                    rules.append({
-                        "id": rule_json.get("id", counter),
-                        "name": rule_json.get("name", "").lower(),
-                        "srcaddr": ", ".join(rule_json.get("source", [])) if isinstance(rule_json.get("source"), list) else str(rule_json.get("source", "")),
-                        "dstaddr": ", ".join(rule_json.get("destination", [])) if isinstance(rule_json.get("destination"), list) else str(rule_json.get("destination", "")),
-                        "service": ", ".join(rule_json.get("services", [])) if isinstance(rule_json.get("services"), list) else str(rule_json.get("services", "")),
-                        "dst_port": extract_port(", ".join(rule_json.get("services", []))) if isinstance(rule_json.get("services"), list) else extract_port(str(rule_json.get("services", ""))),
-                        "action": rule_json.get("action", "").lower(),
-                        "log": log_val,  # ✅ normalized log value
-                        "comment": rule_json.get("comment", "").lower(),
-                        "status": rule_json.get("status", "enable").lower(),
-                        "vendor": "sophos"
-                    })
-                    counter += 1
-                except json.JSONDecodeError as e:
-                    print(f"⚠️ Skipping invalid JSON in Sophos row: {e}")
-
-            return rules
-
-        # ---------------- Client3 CSV ----------------
-        if file_path.endswith(".csv") and vendor == "client3_csv":
-            with open(file_path, newline='', encoding="utf-8") as csvfile:
-                reader = list(csv.reader(csvfile))
-
-            start_index = None
-            for i, row in enumerate(reader):
-                row_lower = [str(c).strip().lower() for c in row]
-                if any("ipv4 local in policy" in cell for cell in row_lower):
-                    start_index = i + 1
-                    break
-
-            if start_index is None:
-                print("❌ No IPv4 Local In Policy section found.")
-                return []
-
-            headers = [h.strip().lower() for h in reader[start_index]]
-            df = pd.DataFrame(reader[start_index + 1:], columns=headers).fillna("")
-
-            if "policyid" not in df.columns:
-                print("❌ No policyid column in IPv4 Local In Policy section")
-                return []
-
-            df = df[df["policyid"].astype(str).str.strip().str.isdigit()]
-
-            for _, row in df.iterrows():
-                rid = row.get("policyid", "").strip()
-                if not rid.isdigit():
-                    continue
-                service_val = row.get("service", "").strip()
-
-                rules.append({
-                    "id": rid,
-                    "name": row.get("comments", "").lower(),
-                    "srcaddr": row.get("srcaddr", "").lower(),
-                    "dstaddr": row.get("dstaddr", "").lower(),
-                    "service": service_val.lower(),
-                    "dst_port": extract_port(service_val),
-                    "action": row.get("action", "").lower(),
-                    "log": row.get("log", "log all sessions").lower(),
-                    "srcaddr_negate": row.get("srcaddr-negate", "").lower(),
-                    "dstaddr_negate": row.get("dstaddr-negate", "").lower(),
-                    "service_negate": row.get("service-negate", "").lower(),
-                    "comment": row.get("comments", "").lower(),
-                    "status": get_col_value(row, df, "status", mappings, vendor) or "enable",
-                    "vendor": vendor
-                })
-
-        # ---------------- Check Point CSV ----------------
-        elif file_path.endswith(".csv") and vendor == "checkpoint":
-            rules = []
-            with open(file_path, "r", encoding="utf-8-sig") as f:
-                reader = csv.reader(f, delimiter=",", quotechar='"')
-                rows = list(reader)
-
-                for line in rows[1:]:
-                    if not line or not line[0].strip():
-                        continue
-
-                    parts = next(csv.reader([line[0]], delimiter=",", quotechar='"'))
-
-                    while len(parts) < 10:
-                        parts.append("")
-
-                    num, name, source, destination, service, action, track, install_on, enabled, comments = parts
-
-                    rules.append({
-                        "id": num,
-                        "name": name.lower(),
-                        "srcaddr": source.lower(),
-                        "dstaddr": destination.lower(),
-                        "service": service.lower(),
-                        "dst_port": extract_port(service),
-                        "action": action.lower(),
-                        "log": track.lower(),
-                        "comment": comments.lower(),
-                        "status": "enable" if enabled.lower() in ["true", "yes", "1"] else "disable",
-                        "vendor": vendor
-                    })
-
-            return rules
-
-        # ---------------- Generic CSV (Client1, Fortinet, etc.) ----------------
-        elif file_path.endswith(".csv"):
-            df = pd.read_csv(file_path, dtype=str, delimiter=",", quotechar='"', engine="python").fillna("")
-            df.columns = [str(c).strip().lower() for c in df.columns]
-
-            id_field = None
-            for alias in mappings.get("id", []):
-                if alias.lower() in df.columns:
-                    id_field = alias.lower()
-                    break
-            if not id_field:
-                return []
-
-            df = df[df[id_field].astype(str).str.strip().str.isdigit()]
-
-            grouped = {}
-            for _, row in df.iterrows():
-                rid = get_col_value(row, df, "id", mappings, vendor)
-                if not rid:
-                    continue
-                if rid not in grouped:
-                    grouped[rid] = {
-                        "id": rid,
-                        "name": get_col_value(row, df, "name", mappings, vendor),
-                        "srcaddr": set(),
-                        "dstaddr": set(),
-                        "service": set(),
-                        "action": get_col_value(row, df, "action", mappings, vendor),
-                        "log": get_col_value(row, df, "log", mappings, vendor),
-                        "comment": get_col_value(row, df, "comment", mappings, vendor),
-                        "risk_rating": get_col_value(row, df, "risk_rating", mappings, vendor),
-                        "status": get_col_value(row, df, "status", mappings, vendor) or "enable",
-                        "vendor": vendor
-                    }
-                src = get_col_value(row, df, "srcaddr", mappings, vendor)
-                if src: grouped[rid]["srcaddr"].add(src)
-                dst = get_col_value(row, df, "dstaddr", mappings, vendor)
-                if dst: grouped[rid]["dstaddr"].add(dst)
-                svc = get_col_value(row, df, "service", mappings, vendor)
-                if svc: grouped[rid]["service"].add(svc)
-
-            for rid, rule in grouped.items():
-                service_str = ", ".join(sorted(rule["service"]))
-                rules.append({
-                    "id": rule["id"],
-                    "name": rule["name"],
-                    "srcaddr": ", ".join(sorted(rule["srcaddr"])),
-                    "dstaddr": ", ".join(sorted(rule["dstaddr"])),
-                    "service": service_str,
-                    "dst_port": extract_port(service_str),
-                    "action": rule["action"],
-                    "log": rule["log"],
-                    "comment": rule["comment"],
-                    "risk_rating": rule["risk_rating"],
-                    "status": rule["status"],
-                    "vendor": rule["vendor"]
-                })
-
-        # ---------------- XLSX (Client1, Client2, etc.) ----------------
-        elif file_path.endswith(".xlsx"):
-            if vendor == "client2":
-                df = pd.read_excel(file_path, sheet_name=0, dtype=str, header=0, engine="openpyxl").fillna("")
-                df.columns = [str(c).strip().lower() for c in df.columns]
-            else:
-                df_all = pd.read_excel(file_path, sheet_name=0, dtype=str, header=None, engine="openpyxl")
-
-                first_header_idx = None
-                for i, row in df_all.iterrows():
-                    row_lower = [str(cell).strip().lower() for cell in row.values]
-                    if "seq #" in row_lower and "action" in row_lower:
-                        first_header_idx = i
-                        break
-                if first_header_idx is None:
-                    return []
-
-                df = pd.read_excel(file_path, sheet_name=0, dtype=str, header=first_header_idx, engine="openpyxl").fillna("")
-                df.columns = [str(c).strip().lower() for c in df.columns]
-                df = df.loc[:, ~df.columns.str.contains("^unnamed")]
-                df = df[~df['seq #'].str.contains("seq #", case=False, na=False)]
-
-            id_field = None
-            for alias in mappings.get("id", []):
-                if alias.lower() in df.columns:
-                    id_field = alias.lower()
-                    break
-            if not id_field:
-                return []
-
-            df = df[df[id_field].astype(str).str.strip() != ""]
-
-            grouped = {}
-            for _, row in df.iterrows():
-                rid = get_col_value(row, df, "id", mappings, vendor)
-                if not rid or not str(rid).isdigit():
-                    continue
-
-                if rid not in grouped:
-                    grouped[rid] = {
-                        "id": rid,
-                        "name": get_col_value(row, df, "name", mappings, vendor),
-                        "srcaddr": set(),
-                        "dstaddr": set(),
-                        "service": set(),
-                        "action": get_col_value(row, df, "action", mappings, vendor),
-                        "log": get_col_value(row, df, "log", mappings, vendor),
-                        "comment": get_col_value(row, df, "comment", mappings, vendor),
-                        "risk_rating": get_col_value(row, df, "risk_rating", mappings, vendor),
-                        "status": get_col_value(row, df, "status", mappings, vendor) or "enable",
-                        "vendor": vendor
-                    }
-
-                src = get_col_value(row, df, "srcaddr", mappings, vendor)
-                if src: grouped[rid]["srcaddr"].add(src)
-                dst = get_col_value(row, df, "dstaddr", mappings, vendor)
-                if dst: grouped[rid]["dstaddr"].add(dst)
-                svc = get_col_value(row, df, "service", mappings, vendor)
-                if svc: grouped[rid]["service"].add(svc)
-
-            for rid, rule in grouped.items():
-                service_str = ", ".join(sorted(rule["service"]))
-                rules.append({
-                    "id": rule["id"],
-                    "name": rule["name"],
-                    "srcaddr": ", ".join(sorted(rule["srcaddr"])),
-                    "dstaddr": ", ".join(sorted(rule["dstaddr"])),
-                    "service": service_str,
-                    "dst_port": extract_port(service_str),
-                    "action": rule["action"],
-                    "log": rule["log"],
-                    "comment": rule["comment"],
-                    "risk_rating": rule["risk_rating"],
-                    "status": rule["status"],
-                    "vendor": rule["vendor"]
-                })
 
+def parse_file(file_path, vendor=None):
+    """Parse CSV/XLSX into normalized firewall rules (Rule records) using vendor mappings."""
+    vendor, mappings = resolve_vendor(file_path, vendor)
+    if not vendor:
+        return []
+
+    try:
+        kind, source = open_rule_source(file_path, vendor, mappings)
+        if kind == "rules":
+            return [Rule.from_dict(rule) for rule in source]
+        if kind == "frames":
+            return [Rule.from_dict(rule) for rule in stream_group_rules(source, vendor)]
     except Exception as e:
         print(f"❌ Error parsing file: {e}")
-        return []
 
-    return rules
\ No newline at end of file
+    return []
+
+
+def parse_file_iter(file_path, vendor=None, chunksize=10000, strict=False, sheet_index=0):
+    """
+    Generator version of parse_file(): yields rules lazily with bounded memory.
+    Multi-row rules are grouped while streaming and flushed once their id changes.
+    With strict=True parse errors are raised instead of printed. sheet_index picks
+    the worksheet of an XLSX export.
+    """
+    vendor, mappings = resolve_vendor(file_path, vendor)
+    if not vendor:
+        return
+
+    try:
+        kind, source = open_rule_source(file_path, vendor, mappings, chunksize, sheet_index)
+        if kind == "rules":
+            yield from map(Rule.from_dict, source)
+        elif kind == "frames":
+            yield from map(Rule.from_dict, stream_group_rules(source, vendor))
+    except Exception as e:
+        if strict:
+            raise
+        print(f"❌ Error parsing file: {e}")
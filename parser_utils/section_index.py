@@ -0,0 +1,127 @@
+# This file is part of FireFind Project.
+#
+# Copyright (C) 2025 Your Name
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import csv
+import json
+import mmap
+import os
+import re
+
+# A section title is a lone unquoted cell, optionally padded with commas ("IPv4 Local In Policy,,,,")
+SECTION_TITLE = re.compile(rb'^[ \t]*([A-Za-z][^,"\r\n]*?)[ \t]*,*\r?$', re.MULTILINE)
+
+# Bump when build_section_index() changes what it accepts as a title
+INDEX_VERSION = 2
+
+
+def index_path(file_path):
+    """Location of the cached index, stored next to the export as a dotfile."""
+    folder, name = os.path.split(file_path)
+    return os.path.join(folder, f".{name}.sections.json")
+
+
+def is_blank_row(line):
+    return not line.strip(b" \t,\r\n")
+
+
+def build_section_index(file_path):
+    """
+    Scan the memory-mapped file once and return [(section name, byte offset), ...].
+    A title line must lie outside quoted cells (an even number of quotes before it)
+    and start the file or follow a blank row, so a lone line of a multi-line comment
+    or a rule row with only its first cell filled is not taken for one.
+    """
+    if os.path.getsize(file_path) == 0:
+        return []
+
+    sections = []
+    with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        quotes, scanned = 0, 0
+        for m in SECTION_TITLE.finditer(mm):
+            start = m.start()
+            quotes += mm[scanned:start].count(b'"')
+            scanned = start
+            if quotes % 2:
+                continue
+            if start and not is_blank_row(mm[mm.rfind(b"\n", 0, start - 1) + 1:start]):
+                continue
+            sections.append((m.group(1).decode("utf-8", "replace").strip().lower(), start))
+    return sections
+
+
+def load_section_index(file_path):
+    """Return the section index, reusing the cached copy while the file is unchanged."""
+    stat = os.stat(file_path)
+    cache = index_path(file_path)
+
+    try:
+        with open(cache, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if (cached.get("version") == INDEX_VERSION and cached.get("size") == stat.st_size
+                and cached.get("mtime_ns") == stat.st_mtime_ns):
+            return [tuple(entry) for entry in cached["sections"]]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    sections = build_section_index(file_path)
+    try:
+        with open(cache, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                       "sections": sections}, f)
+    except OSError:
+        pass  # read-only location; the index is simply rebuilt next time
+
+    return sections
+
+
+def list_sections(file_path):
+    """Names of all sections in the export, in file order."""
+    return [name for name, _ in load_section_index(file_path)]
+
+
+def find_section(index, section):
+    """Return (start, end) byte offsets of the first section whose name contains section."""
+    section = section.strip().lower()
+    for i, (name, start) in enumerate(index):
+        if section in name:
+            end = index[i + 1][1] if i + 1 < len(index) else None
+            return start, end
+    return None
+
+
+def iter_section_lines(file_path, start, end=None):
+    """Seek to a section and yield its decoded lines, title line excluded."""
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        pos = start + len(f.readline())
+        while end is None or pos < end:
+            line = f.readline()
+            if not line:
+                break
+            pos += len(line)
+            yield line.decode("utf-8")
+
+
+def iter_section_rows(file_path, section):
+    """
+    Stream the CSV rows of one section (header row first). Returns None when the
+    section does not exist.
+    """
+    bounds = find_section(load_section_index(file_path), section)
+    if bounds is None:
+        return None
+    return csv.reader(iter_section_lines(file_path, *bounds))
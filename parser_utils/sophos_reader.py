@@ -0,0 +1,52 @@
+# This file is part of FireFind Project.
+#
+# Copyright (C) 2025 Your Name
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import csv
+import json
+
+_decoder = json.JSONDecoder()
+
+
+def iter_sophos_rules(file_path):
+    """
+    Stream rule objects from a Sophos XG export where the JSON document is
+    written one line per CSV cell ({"rules": [ {...}, {...} ]}).
+    The file is read line by line, so memory stays flat regardless of size.
+    """
+    with open(file_path, newline="", encoding="utf-8-sig") as f:
+        for row in csv.reader(f):
+            if not row:
+                continue
+
+            # csv.reader has already undone the "" quote escaping
+            cell = row[0].strip()
+
+            # Wrapper lines ('{', '"rules": [', ']', '}') carry no rule
+            if not cell.startswith("{") or cell == "{":
+                continue
+
+            try:
+                obj, _ = _decoder.raw_decode(cell)
+            except json.JSONDecodeError as e:
+                print(f"⚠️ Skipping invalid JSON in Sophos row: {e}")
+                continue
+
+            # Compact exports put the whole document in a single cell
+            if isinstance(obj.get("rules"), list):
+                yield from obj["rules"]
+            else:
+                yield obj
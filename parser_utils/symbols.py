@@ -0,0 +1,71 @@
+# This file is part of FireFind Project.
+#
+# Copyright (C) 2025 Your Name
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import sys
+
+
+class SymbolTable:
+    """
+    Dictionary encoding for address/service tokens: each distinct string is stored
+    once and referred to by an integer code. Codes are only meaningful inside the
+    process that assigned them, so anything pickled or cached must carry text
+    (or the receiving process must load() a snapshot() first).
+    """
+
+    def __init__(self):
+        self._codes = {}
+        self._texts = []
+
+    def code(self, text):
+        """Code for text, assigning the next free one on first sight."""
+        code = self._codes.get(text)
+        if code is None:
+            text = sys.intern(text)
+            code = len(self._texts)
+            self._codes[text] = code
+            self._texts.append(text)
+        return code
+
+    def text(self, code):
+        return self._texts[code]
+
+    def encode(self, tokens):
+        return tuple(map(self.code, tokens))
+
+    def decode(self, codes):
+        return tuple(self._texts[c] for c in codes)
+
+    def codes(self, texts):
+        """Frozenset of codes for lowercased config values (used by the checker)."""
+        return frozenset(self.code(str(t).lower()) for t in texts)
+
+    def snapshot(self):
+        """All texts in code order, for handing the table to a worker process."""
+        return list(self._texts)
+
+    def load(self, texts):
+        """Adopt a snapshot() so codes agree with the process that took it."""
+        for code, text in enumerate(texts):
+            if self.code(text) != code:
+                raise ValueError("symbol table already holds different codes")
+
+    def __len__(self):
+        return len(self._texts)
+
+
+# One table shared by the parser, checker and exporters
+SYMBOLS = SymbolTable()
@@ -0,0 +1,55 @@
+# This file is part of FireFind Project.
+#
+# Copyright (C) 2025 Your Name
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import contextlib
+import io
+import os
+
+from parser_utils import parse_cache
+
+
+def parse_sheet(file_path, vendor, sheet_index, use_cache=True):
+    """Pool worker: parse one sheet quietly; errors are raised back to the parent."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return list(parse_cache.iter_rules(file_path, vendor, use_cache, sheet_index, strict=True))
+
+
+def parse_sheets(file_path, vendor, sheets, use_cache=True, workers=None):
+    """
+    Parse each (sheet index, sheet name) in a process pool and yield
+    (sheet name, rules) in workbook order.
+    """
+    workers = min(len(sheets), workers or os.cpu_count() or 1)
+
+    if workers <= 1:
+        for index, name in sheets:
+            try:
+                yield name, parse_sheet(file_path, vendor, index, use_cache)
+            except Exception as e:
+                print(f"❌ Error parsing sheet {name}: {e}")
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [(name, pool.submit(parse_sheet, file_path, vendor, index, use_cache))
+                   for index, name in sheets]
+        for name, future in futures:
+            try:
+                yield name, future.result()
+            except Exception as e:
+                print(f"❌ Error parsing sheet {name}: {e}")
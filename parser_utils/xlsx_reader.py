@@ -0,0 +1,124 @@
+# This file is part of FireFind Project.
+#
+# Copyright (C) 2025 Your Name
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Strings pandas.read_excel treats as missing; they end up as "" after fillna("")
+NA_VALUES = {
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a",
+    "nan", "null",
+}
+
+
+def cell_to_str(value):
+    """Render a cell the way pd.read_excel(dtype=str).fillna("") would."""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    text = str(value)
+    return "" if text in NA_VALUES else text
+
+
+def normalize_headers(row):
+    """Lowercase/strip header cells, name blanks 'unnamed: N' and suffix duplicates (.1, .2)."""
+    columns = []
+    seen = {}
+    for i, cell in enumerate(row):
+        name = "" if cell is None else str(cell).strip().lower()
+        if not name:
+            name = f"unnamed: {i}"
+        count = seen.get(name, 0)
+        seen[name] = count + 1
+        columns.append(f"{name}.{count}" if count else name)
+    return columns
+
+
+class PolicySheet:
+    """
+    One pass over a read-only worksheet: the header row is located on open and
+    data rows are streamed afterwards, skipping repeated header rows.
+    """
+
+    def __init__(self, workbook, rows, columns, marker):
+        self.workbook = workbook
+        self.columns = columns
+        self.marker = marker
+        self._rows = rows
+
+    def rows(self, usecols=None):
+        """Yield data rows as lists of strings, restricted to usecols if given."""
+        usecols = usecols or [c for c in self.columns if not c.startswith("unnamed")]
+        indexes = [self.columns.index(c) for c in usecols]
+        marker_idx = self.columns.index(self.marker) if self.marker else None
+        width = len(self.columns)
+
+        try:
+            for row in self._rows:
+                if len(row) < width:
+                    row = tuple(row) + (None,) * (width - len(row))
+                if marker_idx is not None and self.marker in cell_to_str(row[marker_idx]).lower():
+                    continue
+                yield [cell_to_str(row[i]) for i in indexes]
+        finally:
+            self.close()
+
+    def close(self):
+        self.workbook.close()
+
+
+def open_policy_sheet(file_path, header_markers=None, sheet_index=0):
+    """
+    Open a sheet and position it after the first row containing all header_markers.
+    Without markers the first row is the header (plain tabular exports such as Client2).
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    rows = workbook.worksheets[sheet_index].iter_rows(values_only=True)
+
+    if not header_markers:
+        header = next(rows, None)
+        if header is not None:
+            return PolicySheet(workbook, rows, normalize_headers(header), None)
+        workbook.close()
+        return None
+
+    for row in rows:
+        row_lower = [str(cell).strip().lower() for cell in row]
+        if all(marker in row_lower for marker in header_markers):
+            return PolicySheet(workbook, rows, normalize_headers(row), header_markers[0])
+
+    workbook.close()
+    return None
+
+
+def find_policy_sheets(file_path, header_markers, max_rows=50):
+    """Return [(sheet index, sheet name)] for sheets with a header row in their first max_rows rows."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        found = []
+        for index, worksheet in enumerate(workbook.worksheets):
+            for row in worksheet.iter_rows(max_row=max_rows, values_only=True):
+                row_lower = [str(cell).strip().lower() for cell in row]
+                if all(marker in row_lower for marker in header_markers):
+                    found.append((index, worksheet.title))
+                    break
+        return found
+    finally:
+        workbook.close()
@@ -0,0 +1,144 @@
+# This file is part of FireFind Project.
+#
+# Copyright (C) 2025 Your Name
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Images drawn into every report (the circular logos), processed once per source
+content and pixel size: kept in memory for the life of the process and stored
+under cache/ across runs. An entry is the image record fpdf builds when it parses
+a PNG (compressed colour rows plus a soft mask), so PDFReport hands it to fpdf as
+is instead of saving a PNG that fpdf would decode and split again per report.
+On disk a record is a JSON header line followed by its raw zlib streams.
+"""
+
+import hashlib
+import json
+import os
+import zlib
+
+ASSET_CACHE_DIR = "cache"
+
+# Bump when the stored records change shape or content
+ASSET_VERSION = "2"
+
+# Record fields kept in the header with their types; the zlib streams follow it
+HEADER_FIELDS = {"w": int, "h": int, "cs": str, "bpc": int, "f": str, "dp": str, "pal": str, "trns": str}
+STREAMS = ("data", "smask")
+
+# (kind, source digest, pixels) -> fpdf image record
+ASSETS = {}
+
+# Source path -> ((mtime_ns, size), digest); the file is only re-hashed when it changes
+DIGESTS = {}
+
+
+def source_digest(path):
+    """SHA-256 of a source asset's bytes (+ ASSET_VERSION)."""
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    known = DIGESTS.get(path)
+    if known is None or known[0] != stamp:
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read() + ASSET_VERSION.encode("utf-8")).hexdigest()
+        known = DIGESTS[path] = (stamp, digest)
+    return known[1]
+
+
+def asset_path(kind, digest, pixels, cache_dir=ASSET_CACHE_DIR):
+    return os.path.join(cache_dir, f"{kind}-{digest}-{pixels}.asset")
+
+
+def load_asset(kind, digest, pixels, cache_dir=ASSET_CACHE_DIR):
+    """The record stored for this source and size, or None."""
+    try:
+        with open(asset_path(kind, digest, pixels, cache_dir), "rb") as f:
+            header = json.loads(f.readline())
+            record = {name: header[name] for name in HEADER_FIELDS}
+            if header["version"] != ASSET_VERSION or not all(
+                    type(record[name]) is expected for name, expected in HEADER_FIELDS.items()):
+                return None
+            for name in STREAMS:
+                size = header[f"{name}_bytes"]
+                record[name] = f.read(size)
+                if len(record[name]) != size:
+                    return None
+            if f.read(1):
+                return None
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return record
+
+
+def store_asset(kind, digest, pixels, record, cache_dir=ASSET_CACHE_DIR):
+    header = {name: record[name] for name in HEADER_FIELDS}
+    header["version"] = ASSET_VERSION
+    header.update((f"{name}_bytes", len(record[name])) for name in STREAMS)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        path = asset_path(kind, digest, pixels, cache_dir)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(json.dumps(header).encode("utf-8") + b"\n")
+            for name in STREAMS:
+                f.write(record[name])
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # the cache is an optimisation; the record itself was built fine
+
+
+def png_rows(raw, stride):
+    """Raw scanlines with the PNG "None" filter byte fpdf's /Predictor 15 decoding expects."""
+    return b"".join(b"\x00" + raw[i:i + stride] for i in range(0, len(raw), stride))
+
+
+def circular_record(path, pixels):
+    """
+    fpdf image record of the source masked to the ellipse filling it, scaled down
+    (never up) so neither side exceeds pixels.
+    """
+    from PIL import Image, ImageDraw
+
+    img = Image.open(path).convert("RGBA")
+    scale = pixels / max(img.size)
+    if scale < 1:
+        img = img.resize((max(1, round(img.width * scale)), max(1, round(img.height * scale))), Image.LANCZOS)
+
+    w, h = img.size
+    mask = Image.new("L", (w, h), 0)
+    ImageDraw.Draw(mask).ellipse((0, 0, w, h), fill=255)
+    img.putalpha(mask)
+
+    return {
+        "w": w, "h": h, "cs": "DeviceRGB", "bpc": 8, "f": "FlateDecode",
+        "dp": f"/Predictor 15 /Colors 3 /BitsPerComponent 8 /Columns {w}",
+        "pal": "", "trns": "",
+        "data": zlib.compress(png_rows(img.convert("RGB").tobytes(), w * 3)),
+        "smask": zlib.compress(png_rows(img.getchannel("A").tobytes(), w)),
+    }
+
+
+def circular_logo(path, pixels):
+    """Cached circular_record(path, pixels): from memory, else cache/, else built and stored."""
+    digest = source_digest(path)
+    key = ("circle", digest, pixels)
+    record = ASSETS.get(key)
+    if record is None:
+        record = load_asset(*key)
+        if record is None:
+            record = circular_record(path, pixels)
+            store_asset(*key, record)
+        ASSETS[key] = record
+    return record
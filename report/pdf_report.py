@@ -17,14 +17,42 @@
 
 
 from fpdf import FPDF
-import matplotlib.pyplot as plt
 from datetime import datetime
-from PIL import Image, ImageDraw
 import os
 
-# Ensure the folder for charts exists
+from checker.findings_table import NO_ISSUES
+from report import asset_cache
+
+# Folder for rendered charts; created on first use, not at import.
+# matplotlib is imported by the method that draws with it.
 OUTPUT_DIR = "report_charts"
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+# Logos are rasterized for print at this resolution (never above the source's own)
+LOGO_DPI = 300
+
+# Findings listed one per row in the PDF table; the rest are counted per issue
+# (the CSV always has every finding), which keeps page count and build time bounded
+MAX_TABLE_FINDINGS = 5000
+
+TABLE_HEADERS = ["Rule ID", "Issue", "Field", "Value", "Severity", "Rule Category"]
+TABLE_WIDTHS = [18, 55, 24, 27, 25, 33]
+SUMMARY_HEADERS = ["Issue", "Severity", "Rule Category", "Findings"]
+SUMMARY_WIDTHS = [80, 25, 52, 25]
+ROW_HEIGHT = 8
+
+SEVERITY_FILLS = {
+    "CRITICAL": (255, 50, 50),
+    "HIGH": (255, 100, 0),
+    "MEDIUM": (255, 200, 0),
+    "LOW": (180, 220, 100),
+    "INFO": (220, 220, 220),
+}
+
+
+def output_path(name):
+    """Path of an image in OUTPUT_DIR, creating the folder if needed."""
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    return os.path.join(OUTPUT_DIR, name)
 
 class PDFReport(FPDF):
     def header(self):
@@ -46,29 +74,24 @@ class PDFReport(FPDF):
         self.set_text_color(100)
         self.cell(0, 10, f"Page {self.page_no()}", align="C")
 
-    def make_circular_logo(self, logo_path, output_name="circular_logo.png"):
-        img = Image.open(logo_path).convert("RGBA")
-        w, h = img.size
-        mask = Image.new("L", (w, h), 0)
-        draw = ImageDraw.Draw(mask)
-        draw.ellipse((0, 0, w, h), fill=255)
-        img.putalpha(mask)
-
-        output_path = os.path.join(OUTPUT_DIR, output_name)
-        img.save(output_path)
-        return output_path
+    def place_circular_logo(self, logo_path, x, y, size):
+        """Draw a logo masked to a circle, from the report asset cache."""
+        pixels = round(size / 25.4 * LOGO_DPI)
+        name = f"{logo_path}@{pixels}"
+        if name not in self.images:
+            # fpdf drops an image's data once written, so each document gets its own copy
+            record = asset_cache.circular_logo(logo_path, pixels)
+            self.images[name] = dict(record, i=len(self.images) + 1)
+        self.image(name, x=x, y=y, w=size, h=size)
 
     def add_logos(self, firefind_logo="assets/2.png", triskele_logo="assets/triskele-labs-logo.png", size=45):
-        firefind_circ = self.make_circular_logo(firefind_logo, "firefind_circ.png")
-        triskele_circ = self.make_circular_logo(triskele_logo, "triskele_circ.png")
-
         page_width = self.w
         total_width = size * 2 + 10
         x_start = (page_width - total_width) / 2
         y_start = self.get_y()
 
-        self.image(firefind_circ, x=x_start, y=y_start, w=size, h=size)
-        self.image(triskele_circ, x=x_start + size + 10, y=y_start, w=size, h=size)
+        self.place_circular_logo(firefind_logo, x_start, y_start, size)
+        self.place_circular_logo(triskele_logo, x_start + size + 10, y_start, size)
 
         self.ln(size + 8)
 
@@ -112,6 +135,8 @@ class PDFReport(FPDF):
         if not severity_count and not category_count:
             return
 
+        import matplotlib.pyplot as plt
+
         severity_colors = {
             "CRITICAL": (1.0, 50/255, 50/255),
             "HIGH": (1.0, 100/255, 0),
@@ -148,7 +173,7 @@ class PDFReport(FPDF):
 
         plt.tight_layout()
 
-        chart_path = os.path.join(OUTPUT_DIR, "charts_combined.png")
+        chart_path = output_path("charts_combined.png")
         plt.savefig(chart_path, dpi=150)
         plt.close()
 
@@ -165,39 +190,111 @@ class PDFReport(FPDF):
 
         self.ln(95)
 
-    def add_table(self, findings):
-        self.add_page()
-
-        self.set_left_margin(15)
-        self.set_right_margin(15)
-
+    def table_header(self, headers, widths):
         self.set_font("Arial", "B", 12)
         self.set_fill_color(200, 200, 200)
         self.set_text_color(0)
-        headers = ["Rule ID", "Issue", "Field", "Value", "Severity", "Rule Category"]
-        col_widths = [18, 55, 24, 27, 25, 33]
-
-        for i, header in enumerate(headers):
-            self.cell(col_widths[i], 10, header, border=1, align="C", fill=True)
+        for header, width in zip(headers, widths):
+            self.cell(width, 10, header, border=1, align="C", fill=True)
         self.ln()
-
         self.set_font("Helvetica", "", 10)
-        severity_colors = {
-            "CRITICAL": (255, 50, 50),
-            "HIGH": (255, 100, 0),
-            "MEDIUM": (255, 200, 0),
-            "LOW": (180, 220, 100),
-            "INFO": (220, 220, 220),
-        }
 
-        for row in findings:
-            sev = row.get("severity", "INFO").upper()
-            display_sev = "No Risks" if sev == "INFO" else sev
-            self.set_fill_color(*severity_colors.get(sev, (255, 255, 255)))
-            self.cell(col_widths[0], 8, str(row.get("rule_id", "")), border=0.95, fill=True)
-            self.cell(col_widths[1], 8, row.get("issue_type", ""), border=0.95, fill=True)
-            self.cell(col_widths[2], 8, row.get("field", ""), border=0.95, fill=True)
-            self.cell(col_widths[3], 8, str(row.get("value", "")), border=0.95, fill=True)
-            self.cell(col_widths[4], 8, display_sev, border=0.95, fill=True)
-            self.cell(col_widths[5], 8, row.get("category", "Uncategorized"), border=0.95, fill=True)
+    def table_rows(self, rows, headers, widths):
+        """
+        Render (severity, cells) rows as they are produced, repeating the headers on
+        each new page. The fill colour is only set when the severity changes.
+        """
+        fill = None
+        for severity, cells in rows:
+            if self.get_y() + ROW_HEIGHT > self.page_break_trigger:
+                self.add_page()
+                self.table_header(headers, widths)
+                fill = None
+            if severity != fill:
+                self.set_fill_color(*SEVERITY_FILLS.get(severity, (255, 255, 255)))
+                fill = severity
+            for text, width in zip(cells, widths):
+                self.cell(width, ROW_HEIGHT, text, border=0.95, fill=True)
             self.ln()
+
+    def add_table(self, table, max_findings=None, csv_path=None):
+        """
+        Findings of a FindingsTable, rule by rule. Runs of rules without findings
+        collapse into one row; after max_findings findings (MAX_TABLE_FINDINGS by
+        default) the rest are counted per issue instead, pointing at the CSV.
+        """
+        if max_findings is None:
+            max_findings = MAX_TABLE_FINDINGS
+        self.add_page()
+
+        self.set_left_margin(15)
+        self.set_right_margin(15)
+        self.table_header(TABLE_HEADERS, TABLE_WIDTHS)
+
+        listed = {}
+        self.table_rows(finding_rows(table, max(max_findings, 0), listed), TABLE_HEADERS, TABLE_WIDTHS)
+        if sum(listed.values()) < len(table):
+            self.add_issue_summary(table, listed, csv_path)
+
+    def add_issue_summary(self, table, listed, csv_path=None):
+        """Per-issue counts of the findings add_table didn't list."""
+        shown = sum(listed.values())
+        remaining = sorted(
+            ((count - listed.get(key, 0), key) for key, count in table.issue_count.items()
+             if count > listed.get(key, 0)),
+            key=lambda item: (-item[0], item[1]),
+        )
+
+        if self.get_y() + 26 + ROW_HEIGHT > self.page_break_trigger:
+            self.add_page()
+        self.ln(6)
+        self.set_font("Helvetica", "B", 11)
+        self.set_text_color(0)
+        self.multi_cell(0, 6, f"Showing {shown} of {len(table)} findings. The remaining "
+                              f"{len(table) - shown} are counted per issue below; every finding is "
+                              f"listed in {csv_path or 'the CSV report'}.")
+        self.ln(2)
+
+        self.table_header(SUMMARY_HEADERS, SUMMARY_WIDTHS)
+        rows = ((severity.upper(), [issue, display_severity(severity), category, str(count)])
+                for count, (issue, severity, category) in remaining)
+        self.table_rows(rows, SUMMARY_HEADERS, SUMMARY_WIDTHS)
+
+
+def display_severity(severity):
+    severity = severity.upper()
+    return "No Risks" if severity == "INFO" else severity
+
+
+def clean_row(table, first, last):
+    """One row for the rules at positions first..last, none of which has findings."""
+    label = str(table.rule_ids[first])
+    if last > first:
+        label = f"{label}-{table.rule_ids[last]}"
+    count = "-" if last == first else f"{last - first + 1} rules"
+    return "INFO", [label, NO_ISSUES, "-", count, display_severity("INFO"), "-"]
+
+
+def finding_rows(table, max_findings, listed):
+    """
+    (severity, cells) rows of the first max_findings findings, with a clean_row()
+    for each gap between rules that have findings. Walks the findings rather than
+    the rules, so the cost follows max_findings, not the rule count. Counts the
+    listed findings per (issue, severity, category) into listed.
+    """
+    shown, end, previous = 0, len(table), -1
+    while shown < end and shown < max_findings:
+        pos = table.rules[shown]
+        if pos > previous + 1:
+            yield clean_row(table, previous + 1, pos - 1)
+
+        rule_id = str(table.rule_ids[pos])
+        for issue, field, value, severity, category in table.findings(pos)[:max_findings - shown]:
+            key = (issue, severity, category)
+            listed[key] = listed.get(key, 0) + 1
+            shown += 1
+            yield severity.upper(), [rule_id, issue, field, value, display_severity(severity), category]
+        previous = pos
+
+    if shown == end and previous + 1 < table.rule_count:
+        yield clean_row(table, previous + 1, table.rule_count - 1)
@@ -0,0 +1,40 @@
+# This file is part of FireFind Project.
+#
+# Copyright (C) 2025 Your Name
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import pickle
+
+import pytest
+
+from report import asset_cache
+from tests.conftest import ROOT
+
+LOGO = os.path.join(ROOT, "assets", "2.png")
+
+
+def test_record_round_trip(tmp_path):
+    """A stored logo record loads back byte for byte; a pickle at its path is ignored."""
+    pytest.importorskip("PIL")
+    record = asset_cache.circular_record(LOGO, 64)
+    key = ("circle", asset_cache.source_digest(LOGO), 64)
+
+    asset_cache.store_asset(*key, record, cache_dir=str(tmp_path))
+    assert asset_cache.load_asset(*key, cache_dir=str(tmp_path)) == record
+
+    with open(asset_cache.asset_path(*key, cache_dir=str(tmp_path)), "wb") as f:
+        pickle.dump(record, f)
+    assert asset_cache.load_asset(*key, cache_dir=str(tmp_path)) is None
@@ -0,0 +1,60 @@
+# This file is part of FireFind Project.
+#
+# Copyright (C) 2025 Your Name
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+import os
+
+from checker import rule_checker
+from config import config_loader
+from tests.conftest import ROOT
+
+
+def write_config(directory, data):
+    path = directory / "config" / "rules_config.json"
+    path.parent.mkdir(exist_ok=True)
+    path.write_text(json.dumps(data))
+    return path
+
+
+def test_config_without_service_port_map(tmp_path, monkeypatch):
+    """service_port_map is optional; the first get_config() mustn't re-enter itself through listeners."""
+    with open(os.path.join(ROOT, config_loader.DEFAULT_PATH)) as f:
+        data = json.load(f)
+    del data["service_port_map"]
+    path = write_config(tmp_path, data)
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(config_loader, "SHARED", {})
+    monkeypatch.setattr(rule_checker, "COMPILED_CHECKS", {})
+    monkeypatch.setattr(rule_checker, "RISK_INDEXES", {})
+
+    config = config_loader.get_config()
+    assert config.service_port_map() == {}
+    assert rule_checker.evaluate_severity("weak_protocol") == data["risk_rules"]["weak_protocol"]["severity"]
+
+    # Later reloads still reach the listeners
+    rule_checker.compiled_risk_rules(None)
+    data["risk_rules"]["weak_protocol"]["severity"] = "LOW"
+    write_config(tmp_path, data)
+    os.utime(path, ns=(0, 0))
+    assert ("risk_rules",) in config.refresh()
+    assert None not in rule_checker.COMPILED_CHECKS
+    assert rule_checker.evaluate_severity("weak_protocol") == "LOW"
+
+    # Nothing compiled from this config outlives the test
+    for cached in (rule_checker.service_port, rule_checker.service_ports, rule_checker.rule_ports):
+        cached.cache_clear()
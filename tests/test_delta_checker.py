@@ -0,0 +1,79 @@
+# This file is part of FireFind Project.
+#
+# Copyright (C) 2025 Your Name
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import pickle
+
+from checker import delta_checker, policy_analyzer, rule_checker
+from parser_utils import parse_cache
+from tests.conftest import ROOT
+
+CHECKPOINT = os.path.join(ROOT, "sample_data", "additional_vendors", "CheckPoint", "Check-Point-1.csv")
+
+
+def test_delta_keeps_policy_findings():
+    """A delta run reports the same findings as a full run, policy findings included."""
+    rules = list(parse_cache.iter_rules(CHECKPOINT, "checkpoint", use_cache=False))
+    policy = policy_analyzer.analyze_policy(iter(rules), "checkpoint")
+    assert policy
+    expected = [
+        findings + policy.get(idx, [])
+        for idx, findings in rule_checker.run_checker(rules, "checkpoint").items()
+    ]
+
+    current, counts, rows, _ = delta_checker.run_delta(CHECKPOINT, CHECKPOINT, "checkpoint", use_cache=False)
+    assert [findings for _, _, findings in current] == expected
+    assert counts["unchanged"] == len(rules)
+    assert {status for status, _, _ in rows} == {"persisting"}
+
+
+def test_snapshot_round_trip(tmp_path):
+    """Snapshots are stored as JSON and anything else at their path is ignored."""
+    path = str(tmp_path / "previous.findings")
+    snapshot, _ = delta_checker.check_snapshot(CHECKPOINT, "checkpoint", use_cache=False)
+    delta_checker.store_snapshot(path, snapshot)
+    assert delta_checker.load_snapshot(path) == snapshot
+
+    with open(path, "wb") as f:
+        pickle.dump(snapshot, f)
+    assert delta_checker.load_snapshot(path) is None
+
+
+def write_checkpoint(path, rows):
+    """Check Point export with one quoted line per rule, like the samples."""
+    lines = ['"num,name,source,destination,service,action,track,install_on,enabled,comments",,,,,,,']
+    for num, name, source, destination, service, action in rows:
+        lines.append(f'"{num},{name},""{source}"",""{destination}"",""{service}"",{action},Log,FW1,True,""""",,,,,,,')
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_policy_findings_of_unchanged_rules_are_diffed(tmp_path):
+    """A rule inserted ahead of unchanged rules makes their shadowed findings new, and removing it resolves them."""
+    allow = [(10, "Allow_Web", "Internal_Net", "Web_DMZ", "HTTP", "Accept"),
+             (20, "Allow_DNS", "Internal_Net", "Any", "DNS", "Accept")]
+    before = write_checkpoint(tmp_path / "before.csv", allow)
+    after = write_checkpoint(tmp_path / "after.csv", [(5, "Drop_All", "Any", "Any", "Any", "Drop")] + allow)
+
+    _, counts, rows, _ = delta_checker.run_delta(before, after, "checkpoint", use_cache=False)
+    assert counts == {"added": 1, "modified": 0, "unchanged": 2, "removed": 0}
+    shadowed = [(status, rule_id) for status, rule_id, f in rows if f["issue"] == "shadowed_rule"]
+    assert shadowed == [("new", "10"), ("new", "20")]
+
+    _, _, rows, _ = delta_checker.run_delta(after, before, "checkpoint", use_cache=False)
+    shadowed = [(status, rule_id) for status, rule_id, f in rows if f["issue"] == "shadowed_rule"]
+    assert shadowed == [("resolved", "10"), ("resolved", "20")]
@@ -0,0 +1,76 @@
+# This file is part of FireFind Project.
+#
+# Copyright (C) 2025 Your Name
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import glob
+import os
+
+import pytest
+
+from checker import columnar_checker, parallel_checker, rule_checker
+from parser_utils import parse_cache, rule_parser
+from tests.conftest import ROOT
+
+SAMPLES = sorted(
+    os.path.relpath(path, ROOT)
+    for path in glob.glob(os.path.join(ROOT, "sample_data", "**", "*.*"), recursive=True)
+)
+
+
+def sample_rules(path):
+    """Rules of every policy sheet of a sample, parsed without the cache."""
+    vendor = rule_parser.detect_vendor(path)
+    sheets = [(0, None)]
+    if path.endswith(".xlsx"):
+        sheets = rule_parser.find_xlsx_policy_sheets(path, vendor) or sheets
+    return vendor, [
+        list(parse_cache.iter_rules(path, vendor, use_cache=False, sheet_index=index, strict=True))
+        for index, _ in sheets
+    ]
+
+
+@pytest.mark.parametrize("path", SAMPLES)
+def test_engines_agree(path, monkeypatch):
+    """The rows, columnar and parallel engines report the same findings per rule."""
+    # Small chunks, so the parallel run goes through several blocks and the read-ahead window
+    monkeypatch.setattr(parallel_checker, "CHUNK_RULES", 7)
+    vendor, sheets = sample_rules(path)
+    if not any(sheets):
+        pytest.skip(f"no rules parsed from {path}")
+    for rules in sheets:
+        expected = rule_checker.run_checker(rules, vendor)
+        assert columnar_checker.run_checker(rules, vendor) == expected
+        assert parallel_checker.run_checker(rules, vendor, workers=2, min_rules=1) == expected
+
+
+def test_columnar_keeps_rule_text_out_of_symbols():
+    """Names and comments of a new file don't grow the process-wide symbol table."""
+    from parser_utils.rule_model import Rule
+    from parser_utils.symbols import SYMBOLS
+
+    def rules(tag):
+        return [
+            Rule.from_dict({"id": str(pos), "name": f"{tag} rule {pos}", "comment": f"{tag} ticket {pos}",
+                            "srcaddr": "any", "dstaddr": "10.0.0.0/8", "service": "tcp/3389",
+                            "action": "accept", "status": "enable", "log": f"{tag} log"})
+            for pos in range(1, 50)
+        ]
+
+    columnar_checker.run_checker(rules("first"), "sophos")
+    before = len(SYMBOLS)
+    checked = columnar_checker.run_checker(rules("second"), "sophos")
+    assert len(SYMBOLS) == before
+    assert checked == rule_checker.run_checker(rules("second"), "sophos")
@@ -0,0 +1,52 @@
+# This file is part of FireFind Project.
+#
+# Copyright (C) 2025 Your Name
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from checker.findings_table import NO_ISSUES, FindingsTable
+from parser_utils.symbols import SYMBOLS
+
+
+def test_findings_stay_out_of_global_symbols():
+    """Finding texts are interned per table and read back unchanged."""
+    before = len(SYMBOLS)
+    table = FindingsTable()
+    table.add("1", [{"issue": "broad_source", "field": "comment", "value": "Temporary rule for ticket 4711",
+                     "severity": "HIGH", "category": "Exposure"}])
+    table.add("2", [])
+
+    assert len(SYMBOLS) == before
+    assert list(table.rows()) == [
+        ("1", "broad_source", "comment", "Temporary rule for ticket 4711", "HIGH", "Exposure"),
+        ("2", NO_ISSUES, "-", "-", "", "-"),
+    ]
+
+
+def test_merge_appends_to_checked_rules():
+    """Late findings land after a rule's own ones and update the rollups."""
+    table = FindingsTable()
+    own = {"issue": "any_service", "field": "service", "value": "any", "severity": "MEDIUM", "category": "Exposure"}
+    late = {"issue": "redundant_rule", "field": "redundant_to", "value": "10", "severity": "LOW",
+            "category": "Rule Hygiene"}
+    for rule_id, findings in (("10", [own]), ("20", []), ("30", [own]), ("40", [])):
+        table.add(rule_id, findings)
+
+    table.merge({1: [late], 2: [late]})
+    assert [row[:2] for row in table.rows()] == [
+        ("10", "any_service"), ("20", "redundant_rule"), ("30", "any_service"), ("30", "redundant_rule"),
+        ("40", NO_ISSUES),
+    ]
+    assert table.severity_count == {"MEDIUM": 2, "LOW": 2, "INFO": 1}
+    assert table.category_count == {"Exposure": 2, "Rule Hygiene": 2}
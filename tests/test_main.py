@@ -0,0 +1,87 @@
+# This file is part of FireFind Project.
+#
+# Copyright (C) 2025 Your Name
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import csv
+import os
+
+import main
+from parser_utils import parse_cache, rule_parser
+from tests.conftest import ROOT
+
+SDWAN = os.path.join(ROOT, "sample_data", "Client 3", "xlsx_files", "client3-sdwan-datacentre.xlsx")
+
+
+def test_lone_policy_sheet_after_other_sheets(tmp_path, monkeypatch):
+    """A workbook's only policy sheet is analyzed even when it isn't the first sheet."""
+    from openpyxl import load_workbook
+
+    vendor = rule_parser.detect_vendor(SDWAN)
+    book = load_workbook(SDWAN)
+    book.create_sheet("Notes", 0)["A1"] = "Exported for review"
+    path = str(tmp_path / "client3-sdwan-datacentre.xlsx")
+    book.save(path)
+    assert rule_parser.find_xlsx_policy_sheets(path, vendor) == [(1, "Firewall Policy")]
+
+    csv_path = str(tmp_path / "findings.csv")
+    monkeypatch.setattr(main, "output_paths", lambda file_path: (csv_path, str(tmp_path / "report.pdf")))
+    monkeypatch.setattr(main, "export_findings_to_pdf", lambda *args, **kwargs: None)
+    main.process_file(path, vendor, use_cache=False)
+
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        rule_ids = {row["rule_id"] for row in csv.DictReader(f)}
+    expected = {str(rule.id) for rule in parse_cache.iter_rules(SDWAN, vendor, use_cache=False)}
+    assert expected and rule_ids == expected
+
+
+def test_policy_findings_without_a_second_parse(tmp_path, monkeypatch):
+    """Policy findings come from the checking pass; the export is parsed once."""
+    path = os.path.join(ROOT, "sample_data", "additional_vendors", "CheckPoint", "Check-Point-1.csv")
+    parses = []
+    parse_file_iter = rule_parser.parse_file_iter
+    monkeypatch.setattr(rule_parser, "parse_file_iter",
+                        lambda *args, **kwargs: parses.append(args) or parse_file_iter(*args, **kwargs))
+    csv_path = str(tmp_path / "findings.csv")
+    monkeypatch.setattr(main, "output_paths", lambda file_path: (csv_path, str(tmp_path / "report.pdf")))
+    monkeypatch.setattr(main, "export_findings_to_pdf", lambda *args, **kwargs: None)
+    main.process_file(path, "checkpoint", use_cache=False)
+
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        issues = [row["issue"] for row in csv.DictReader(f)]
+    assert len(parses) == 1
+    assert "redundant_rule" in issues or "shadowed_rule" in issues or "conflicting_rule" in issues
+
+
+def test_exposure_reads_every_policy_sheet(tmp_path, capsys):
+    """-x finds the policy sheets like a normal run and names the sheet of each rule."""
+    from openpyxl import load_workbook
+
+    vendor = rule_parser.detect_vendor(SDWAN)
+    book = load_workbook(SDWAN)
+    book.create_sheet("Notes", 0)["A1"] = "Exported for review"
+    copy = book.copy_worksheet(book["Firewall Policy"])
+    copy.title = "Branch Policy"
+    for row in copy.iter_rows():
+        for cell in row:
+            if cell.value == "edge-azure":
+                cell.value = "10.1.2.0/24"
+    path = str(tmp_path / "client3-sdwan-datacentre.xlsx")
+    book.save(path)
+
+    main.process_exposure(path, "10.1.0.0/16", vendor, use_cache=False)
+    out = capsys.readouterr().out
+    assert "Rules exposing 10.1.0.0/16: 1 of 28 enabled allow rules" in out
+    assert "Rule Branch Policy:8:" in out
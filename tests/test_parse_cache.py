@@ -0,0 +1,97 @@
+# This file is part of FireFind Project.
+#
+# Copyright (C) 2025 Your Name
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import pickle
+
+import pytest
+
+from parser_utils import parse_cache
+from parser_utils.rule_model import Action, Rule
+
+RULES = [
+    Rule.from_dict({"id": "1", "srcaddr": "10.0.0.0/8, hq_lan", "dstaddr": "any", "service": "https",
+                    "action": "accept", "status": "enable", "vendor": "sophos"}),
+    Rule.from_dict({"id": 2, "srcaddr": "any", "dstaddr": "10.1.2.3", "service": "",
+                    "action": "monitor", "log": "no log", "srcaddr_negate": "enable"}),
+    Rule.from_dict({"id": "3", "srcaddr": "any", "dstaddr": "any", "service": "any", "action": "deny"}),
+]
+
+
+def write_entry(cache_dir, name, size, mtime):
+    path = os.path.join(cache_dir, name)
+    with open(path, "wb") as f:
+        f.write(b"\0" * size)
+    os.utime(path, (mtime, mtime))
+
+
+def test_evict_counts_rules_and_snapshots(tmp_path):
+    """Parsed rules and findings snapshots share one LRU size limit."""
+    cache_dir = str(tmp_path)
+    write_entry(cache_dir, "old.findings", 100, 1)
+    write_entry(cache_dir, "old.rules", 100, 2)
+    write_entry(cache_dir, "new.findings", 100, 3)
+    write_entry(cache_dir, "new.rules", 100, 4)
+    write_entry(cache_dir, "notes.txt", 100, 0)
+
+    parse_cache.evict(cache_dir, max_bytes=250)
+    assert sorted(os.listdir(cache_dir)) == ["new.findings", "new.rules", "notes.txt"]
+
+
+def test_rules_round_trip_in_chunks(tmp_path, monkeypatch):
+    """Stored rules come back equal, enum fields included, across several chunks."""
+    monkeypatch.setattr(parse_cache, "CHUNK_RULES", 2)
+    parse_cache.store_rules("key", iter(RULES), str(tmp_path))
+
+    count, rules = parse_cache.load_rules("key", str(tmp_path))
+    rules = list(rules)
+    assert count == len(RULES) and rules == RULES
+    assert rules[0].action is Action.ACCEPT and rules[1].action == "monitor"
+
+
+def test_pickled_entry_is_a_miss(tmp_path):
+    """Only the JSON format is read; anything else at a cache path is ignored."""
+    with open(parse_cache.cache_path("key", str(tmp_path)), "wb") as f:
+        pickle.dump({"columns": list(Rule.__slots__), "data": {}}, f)
+    assert parse_cache.load_rules("key", str(tmp_path)) is None
+
+
+def test_discarded_entry_leaves_nothing(tmp_path, monkeypatch):
+    """A parse that stops part way stores no entry and no temporary file."""
+    monkeypatch.setattr(parse_cache, "CHUNK_RULES", 1)
+    writer = parse_cache.EntryWriter("key", str(tmp_path))
+    for rule in RULES:
+        writer.add(rule)
+    writer.discard()
+    assert os.listdir(tmp_path) == []
+    assert parse_cache.load_rules("key", str(tmp_path)) is None
+
+
+def test_truncated_chunk_is_an_error(tmp_path, monkeypatch):
+    """A chunk cut short raises instead of yielding rules built from the wrong bytes."""
+    monkeypatch.setattr(parse_cache, "CHUNK_RULES", 2)
+    parse_cache.store_rules("key", iter(RULES), str(tmp_path))
+    path = parse_cache.cache_path("key", str(tmp_path))
+    with open(path, "rb") as f:
+        data = f.read()
+    trailer = data[data.rindex(b"\n", 0, -1):]
+    with open(path, "wb") as f:
+        f.write(data[:len(data) // 2] + trailer)
+
+    count, rules = parse_cache.load_rules("key", str(tmp_path))
+    with pytest.raises(ValueError):
+        list(rules)
@@ -0,0 +1,114 @@
+# This file is part of FireFind Project.
+#
+# Copyright (C) 2025 Your Name
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import random
+import time
+
+from checker import policy_analyzer
+from parser_utils.rule_model import Rule
+
+# Growing a policy 10x should cost well under the 100x of a pairwise scan
+SCALE_SIZES = (2000, 20000)
+MAX_SCALE_RATIO = 20.0
+
+
+def address(rng):
+    """Random /16, /24 or /32 in 10/8, with 2% any."""
+    if rng.random() < 0.02:
+        return "any"
+    a, b, c = rng.randrange(256), rng.randrange(256), rng.randrange(256)
+    return rng.choice((f"10.{a}.0.0/16", f"10.{a}.{b}.0/24", f"10.{a}.{b}.{c}"))
+
+
+def synthetic_policy(count, seed=1):
+    """Large policy of random addresses over ~200 services, half accept and half deny; ids step by 10."""
+    rng = random.Random(seed)
+    ports = rng.sample(range(1, 65535), 199)
+    services = ["any"] + [f"tcp/{port}" for port in ports[:150]] + [f"udp/{port}" for port in ports[150:]]
+    return [
+        Rule.from_dict({
+            "id": str(pos * 10),
+            "srcaddr": address(rng),
+            "dstaddr": address(rng),
+            "service": rng.choice(services) if rng.random() > 0.02 else "any",
+            "action": rng.choice(("accept", "deny")),
+            "status": "enable",
+        })
+        for pos in range(1, count + 1)
+    ]
+
+
+def pairwise_issues(rules):
+    """Issue and earlier rule per position found by comparing every pair of rules."""
+    spaces, entries = {}, []
+    for pos in policy_analyzer.evaluation_order([str(rule.id).strip() for rule in rules]):
+        rule = rules[pos]
+        action = str(rule.action).lower()
+        if action not in policy_analyzer.ALLOW_ACTIONS | policy_analyzer.DENY_ACTIONS:
+            continue
+        box = policy_analyzer.rule_spaces(rule, spaces)
+        if box:
+            entries.append((pos, action in policy_analyzer.ALLOW_ACTIONS, box))
+    issues = {}
+    for k, (pos, allows, box) in enumerate(entries):
+        earlier = entries[:k]
+        for other, other_allows, other_box in earlier:
+            if all(o.covers(m) for o, m in zip(other_box, box)):
+                issue = "redundant_rule" if other_allows == allows else "shadowed_rule"
+                issues[pos + 1] = (issue, str(rules[other].id).strip())
+                break
+        else:
+            for other, other_allows, other_box in earlier:
+                if (other_allows != allows
+                        and all(o.overlaps(m) for o, m in zip(other_box, box))
+                        and not all(m.covers(o) for o, m in zip(other_box, box))):
+                    issues[pos + 1] = ("conflicting_rule", str(rules[other].id).strip())
+                    break
+    return issues
+
+
+def test_matches_pairwise_scan():
+    """The indexed search reports the same first earlier rule, by id, as a pairwise scan."""
+    rules = synthetic_policy(1500, seed=3)
+    found = {pos: (issues[0]["issue"], issues[0]["value"])
+             for pos, issues in policy_analyzer.analyze_policy(rules).items()}
+    assert found == pairwise_issues(rules)
+
+
+def test_scales_with_policy_size():
+    """Analysis time grows close to linearly with the number of rules."""
+    timings = []
+    for count in SCALE_SIZES:
+        rules = synthetic_policy(count)
+        best = None
+        for _ in range(2):
+            start = time.perf_counter()
+            policy_analyzer.analyze_policy(rules)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        timings.append(best)
+    assert timings[1] / timings[0] < MAX_SCALE_RATIO, timings
+
+
+def test_workbook_findings_name_the_sheet():
+    """In workbook runs the other rule is named like the sheet-tagged rule ids."""
+    rules = synthetic_policy(300, seed=5)
+    found = policy_analyzer.analyze_policy(rules, sheet="DC")
+    plain = policy_analyzer.analyze_policy(rules)
+    assert found and found.keys() == plain.keys()
+    for pos, issues in found.items():
+        assert issues[0]["value"] == f"DC:{plain[pos][0]['value']}"
@@ -0,0 +1,86 @@
+# This file is part of FireFind Project.
+#
+# Copyright (C) 2025 Your Name
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+
+import pytest
+
+from parser_utils import rule_columns
+from parser_utils.rule_model import Action, Rule, Status
+from parser_utils.symbols import SYMBOLS
+
+
+def sample_rules():
+    return [
+        Rule.from_dict({"id": 7, "name": "Ünïcode ✅", "srcaddr": "10.0.0.0/8 grp-web", "dstaddr": "any",
+                        "service": "tcp/443", "action": "accept", "status": "enable", "log": "all",
+                        "srcaddr_negate": True, "vendor": "fortigate"}),
+        Rule.from_dict({"id": "42", "name": "", "srcaddr": "", "dstaddr": "192.168.1.1",
+                        "service": "ALL", "action": "odd-vendor-action", "risk_rating": None}),
+        Rule.from_dict({"id": 3.5, "dstaddr_negate": False}),
+    ]
+
+
+def flat(buf_parts):
+    return b"".join(bytes(part) for part in buf_parts)
+
+
+@pytest.mark.parametrize("own_symbols", [False, True])
+def test_rules_round_trip(own_symbols):
+    """Every slot comes back with its value and type, enums as enum members."""
+    rules = sample_rules()
+    layout, parts = rule_columns.pack_rules(rules, own_symbols)
+    data = flat(parts)
+    assert len(data) == layout["size"]
+
+    restored = rule_columns.unpack_rules(data, json.loads(json.dumps(layout)))
+    for before, after in zip(rules, restored, strict=True):
+        for slot in Rule.__slots__:
+            assert getattr(after, slot) == getattr(before, slot), slot
+            assert type(getattr(after, slot)) is type(getattr(before, slot)), slot
+    assert restored[0].action is Action.ACCEPT and restored[0].status is Status.ENABLE
+    assert restored[1].action == "odd-vendor-action"
+
+
+def test_own_symbols_survive_a_fresh_table(monkeypatch):
+    """With own_symbols the tokens decode in a process whose codes differ."""
+    rules = sample_rules()
+    layout, parts = rule_columns.pack_rules(rules, own_symbols=True)
+    SYMBOLS.code("shift every later code")
+    fresh = type(SYMBOLS)()
+    fresh.code("a token the packing process never saw")
+    monkeypatch.setattr(rule_columns, "SYMBOLS", fresh)
+    restored = rule_columns.unpack_rules(flat(parts), layout)
+    assert [fresh.decode(rule.srcaddr) for rule in restored] == [SYMBOLS.decode(rule.srcaddr) for rule in rules]
+
+
+def test_layout_is_checked():
+    """Buffers that don't fit the layout raise ValueError instead of building wrong rules."""
+    layout, parts = rule_columns.pack_rules(sample_rules())
+    data = flat(parts)
+    with pytest.raises(ValueError):
+        rule_columns.unpack_rules(data[:len(data) // 2], layout)
+    layout["slots"]["bogus"] = layout["slots"].pop("name")
+    with pytest.raises(ValueError):
+        rule_columns.unpack_rules(data, layout)
+
+
+def test_unpackable_values_are_rejected():
+    rule = Rule.from_dict({"id": "1"})
+    rule.comment = ["not", "a", "scalar"]
+    with pytest.raises(TypeError):
+        rule_columns.pack_rules([rule])
@@ -0,0 +1,37 @@
+# This file is part of FireFind Project.
+#
+# Copyright (C) 2025 Your Name
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+
+from parser_utils import rule_parser
+from tests.conftest import ROOT
+
+CLIENT1 = os.path.join(ROOT, "sample_data", "Client 1")
+DAAS = os.path.join(CLIENT1, "CLIENT1 Firewall Rules - Anonymised - Firewall Policy-INSIDE-DaaS - WITH RISK FEEDBACK.xlsx")
+FW01 = os.path.join(CLIENT1, "CLIENT1 Firewall Rules - Anonymised - Firewall Policy-INSIDE-FW01.xlsx")
+
+
+def test_repeated_ids_in_separate_blocks_stay_separate_rules():
+    """parse_file and parse_file_iter group the same way: only adjacent rows share a rule."""
+    for path, count in ((DAAS, 44), (FW01, 62)):
+        rules = rule_parser.parse_file(path)
+        assert len(rules) == count
+        assert len({rule.id for rule in rules}) < count
+
+        # Chunk borders fall inside id runs, so the carried-over run is exercised too
+        streamed = list(rule_parser.parse_file_iter(path, chunksize=3))
+        assert [rule.to_dict() for rule in streamed] == [rule.to_dict() for rule in rules]
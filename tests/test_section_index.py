@@ -0,0 +1,42 @@
+# This file is part of FireFind Project.
+#
+# Copyright (C) 2025 Your Name
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from parser_utils import section_index
+
+EXPORT = (
+    "Firewall Policy,,,\n"
+    "action,policyid,comments,srcaddr\n"
+    'accept,1,"Opened for the migration\n'
+    "Review later\n"
+    'see change 42",all\n'
+    "deny,,,\n"
+    ",,,\n"
+    "IPv4 Local In Policy,,,\n"
+    "action,policyid,comments,srcaddr\n"
+    "accept,7,,all\n"
+)
+
+
+def test_titles_ignore_quoted_lines_and_sparse_rows(tmp_path):
+    """Comment lines inside quotes and rows with only their first cell are not sections."""
+    path = tmp_path / "export.csv"
+    path.write_text(EXPORT, encoding="utf-8")
+
+    assert section_index.list_sections(str(path)) == ["firewall policy", "ipv4 local in policy"]
+    rows = list(section_index.iter_section_rows(str(path), "firewall policy"))
+    assert rows[1][2] == "Opened for the migration\nReview later\nsee change 42"
+    assert rows[2:] == [["deny", "", "", ""], ["", "", "", ""]]
@@ -0,0 +1,44 @@
+# This file is part of FireFind Project.
+#
+# Copyright (C) 2025 Your Name
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+import subprocess
+import sys
+import time
+
+from tests.conftest import ROOT
+
+HEAVY_MODULES = ["pandas", "numpy", "openpyxl", "matplotlib", "fpdf", "PIL", "curses"]
+
+# Loose: importing main takes ~0.1s; the heavy dependencies together take over a second
+MAX_IMPORT_SECONDS = 2.0
+
+PROBE = f"""
+import json, sys
+import main
+print(json.dumps([name for name in {HEAVY_MODULES!r} if name in sys.modules]))
+"""
+
+
+def test_import_main_is_light():
+    """Heavy dependencies load on the paths that use them, not when main is imported."""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", PROBE], cwd=ROOT, capture_output=True, text=True, check=True)
+    elapsed = time.perf_counter() - start
+
+    assert json.loads(result.stdout.splitlines()[-1]) == []
+    assert elapsed < MAX_IMPORT_SECONDS, f"import main took {elapsed:.2f}s"